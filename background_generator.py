@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Canvas background generator
+Builds solid, linear and multi-stop gradient canvases from a single colour row
+"""
+
+from PIL import Image
+import numpy as np
+
+def gradient_row(width, stops, channels=3):
+    """
+    Compute one row of a horizontal multi-stop gradient.
+
+    Args:
+        width (int): Number of columns
+        stops (list): (position, colour) pairs, position in 0.0-1.0 of the width
+        channels (int): Number of colour channels to produce
+
+    Returns:
+        np.ndarray: uint8 array of shape (width, channels)
+    """
+    if not stops:
+        raise ValueError("A gradient needs at least one colour stop")
+
+    stops = sorted(stops, key=lambda stop: stop[0])
+    positions = np.array([position for position, _ in stops], dtype=np.float64)
+    colours = np.array([_pad_colour(colour, channels) for _, colour in stops], dtype=np.float64)
+
+    ratio = np.arange(width, dtype=np.float64) / width
+    row = np.empty((width, channels), dtype=np.float64)
+    for channel in range(channels):
+        row[:, channel] = np.interp(ratio, positions, colours[:, channel])
+
+    # Truncate like int() so results match the original per-pixel loop
+    return np.clip(row, 0, 255).astype(np.uint8)
+
+def create_gradient_canvas(size, stops, mode="RGB"):
+    """
+    Create a canvas filled with a horizontal gradient.
+
+    The colour row is computed once and broadcast down the height inside
+    Pillow, so no per-pixel work happens in Python.
+
+    Args:
+        size (tuple): (width, height) of the canvas
+        stops (list): (position, colour) pairs, position in 0.0-1.0 of the width
+        mode (str): 'RGB' or 'RGBA'
+
+    Returns:
+        PIL.Image: The gradient canvas
+    """
+    width, height = size
+    channels = len(mode)
+    if mode not in ("RGB", "RGBA"):
+        raise ValueError(f"Unsupported canvas mode: {mode}")
+
+    row = gradient_row(width, stops, channels)
+    row_image = Image.fromarray(row[np.newaxis, :, :], mode)
+    return row_image.resize((width, height), Image.Resampling.NEAREST)
+
+def create_linear_canvas(size, start_colour, end_colour, mode="RGB"):
+    """
+    Create a canvas filled with a two-colour horizontal gradient.
+
+    Args:
+        size (tuple): (width, height) of the canvas
+        start_colour (tuple): Colour at the left edge
+        end_colour (tuple): Colour the gradient approaches at the right edge
+        mode (str): 'RGB' or 'RGBA'
+
+    Returns:
+        PIL.Image: The gradient canvas
+    """
+    return create_gradient_canvas(size, [(0.0, start_colour), (1.0, end_colour)], mode)
+
+def create_canvas(size, background=(255, 255, 255), mode="RGB"):
+    """
+    Create a canvas from either a solid colour or a list of gradient stops.
+
+    Args:
+        size (tuple): (width, height) of the canvas
+        background: Colour tuple, or a list of (position, colour) stops
+        mode (str): 'RGB' or 'RGBA'
+
+    Returns:
+        PIL.Image: The canvas
+    """
+    if isinstance(background, list):
+        return create_gradient_canvas(size, background, mode)
+    return Image.new(mode, size, _pad_colour(background, len(mode)))
+
+def _pad_colour(colour, channels):
+    """Match a colour tuple to the channel count, adding opaque alpha if needed."""
+    colour = tuple(colour)
+    if len(colour) == channels:
+        return colour
+    if len(colour) == 3 and channels == 4:
+        return colour + (255,)
+    if len(colour) == 4 and channels == 3:
+        return colour[:3]
+    raise ValueError(f"Colour {colour} does not fit {channels} channels")
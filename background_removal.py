@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Background-removal service
+Keeps one rembg session alive per model so the ONNX model is loaded only once,
+and reuses cached alpha masks when the input pixels have been seen before.
+rembg is imported on first use, so importing this module works without it
+"""
+
+from PIL import Image, ImageOps
+
+from guided_filter import upsample_mask
+from mask_cache import MaskCache
+
+DEFAULT_MODEL = "u2net"
+# Longest side used for low-resolution inference; the models themselves
+# work at 320-1024 px, so larger inputs only cost pre/postprocessing time
+LOW_RES_INFERENCE_SIZE = 1024
+
+class BackgroundRemover:
+    """
+    Owns a long-lived rembg session for one model.
+
+    Args:
+        model_name (str): rembg model to load (u2net, u2netp, isnet-general-use, ...)
+        cache (MaskCache): Mask cache to use (default: the shared on-disk cache)
+        use_cache (bool): Set to False to always run inference
+        inference_size (int): Default longest side the model is run at; larger
+            inputs are segmented on a downscaled copy and the mask is upsampled
+            with a guided filter (default: full resolution). mask() and
+            remove() can override it per call on the same session.
+    """
+
+    def __init__(self, model_name=DEFAULT_MODEL, cache=None, use_cache=True, inference_size=None):
+        self.model_name = model_name
+        self.inference_size = inference_size
+        self.cache = cache if cache is not None else (MaskCache() if use_cache else None)
+        self._session = None
+
+    @property
+    def session(self):
+        """The rembg session, created on first use."""
+        if self._session is None:
+            from rembg import new_session
+
+            print(f"Loading background-removal model: {self.model_name}")
+            self._session = new_session(self.model_name)
+        return self._session
+
+    def mask(self, image, inference_size=None):
+        """
+        Compute (or fetch from the cache) the foreground alpha mask.
+
+        Args:
+            image (PIL.Image): Upright input image
+            inference_size (int): Longest side to run the model at
+                (default: the remover's inference_size)
+
+        Returns:
+            PIL.Image: 'L' mask, 255 for foreground
+        """
+        inference_size = inference_size or self.inference_size
+        low_res = inference_size and max(image.size) > inference_size
+
+        key = None
+        if self.cache is not None:
+            params = {"inference_size": inference_size} if low_res else {}
+            key = self.cache.key(image, self.model_name, **params)
+            cached = self.cache.load(key)
+            if cached is not None:
+                return cached
+
+        from rembg import remove
+
+        if low_res:
+            small = image.copy()
+            small.thumbnail((inference_size, inference_size),
+                            Image.Resampling.LANCZOS, reducing_gap=3.0)
+            mask = upsample_mask(remove(small, session=self.session, only_mask=True), image)
+        else:
+            mask = remove(image, session=self.session, only_mask=True)
+
+        if key is not None:
+            self.cache.save(key, mask)
+        return mask
+
+    def remove(self, image, inference_size=None):
+        """
+        Remove the background from a single image.
+
+        Args:
+            image: PIL image or path to an image file
+            inference_size (int): Longest side to run the model at
+                (default: the remover's inference_size)
+
+        Returns:
+            PIL.Image: RGBA image with a transparent background
+        """
+        if not isinstance(image, Image.Image):
+            image = Image.open(image)
+        image = ImageOps.exif_transpose(image)
+        return cutout(image, self.mask(image, inference_size))
+
+    def remove_batch(self, images, inference_size=None):
+        """
+        Remove the background from several images back to back.
+
+        Args:
+            images (list): PIL images or image file paths
+            inference_size (int): Longest side to run the model at
+
+        Returns:
+            list: RGBA images, in input order
+        """
+        return [self.remove(image, inference_size) for image in images]
+
+def cutout(image, mask):
+    """
+    Apply a foreground mask the way rembg does.
+
+    Args:
+        image (PIL.Image): Input image
+        mask (PIL.Image): 'L' mask of the same size
+
+    Returns:
+        PIL.Image: RGBA cutout, fully transparent where the mask is 0
+    """
+    empty = Image.new("RGBA", image.size, 0)
+    return Image.composite(image.convert("RGBA"), empty, mask)
+
+_removers = {}
+
+def get_remover(model_name=DEFAULT_MODEL):
+    """
+    Return the shared remover for a model, creating it on first request.
+
+    One session is kept per model; pass inference_size to mask()/remove()
+    to run it at a lower resolution.
+
+    Args:
+        model_name (str): rembg model name
+
+    Returns:
+        BackgroundRemover: Process-wide instance for that model
+    """
+    if model_name not in _removers:
+        _removers[model_name] = BackgroundRemover(model_name)
+    return _removers[model_name]
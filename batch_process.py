@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Batch runner for HEIC ingestion
+Fans process_heic_photo out over a process pool with a bounded number of
+images in flight, and reports a result per file
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import glob
+import os
+import sys
+import time
+
+from background_removal import DEFAULT_MODEL, LOW_RES_INFERENCE_SIZE
+
+HEIC_EXTENSIONS = ('.heic', '.heif')
+
+def find_heic_files(source):
+    """
+    Expand a directory, glob pattern or single file into a sorted file list.
+
+    Args:
+        source (str): Directory, glob pattern (e.g. "shoot/*.HEIC") or file path
+
+    Returns:
+        list: Matching file paths
+    """
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name)
+            for name in os.listdir(source)
+            if name.lower().endswith(HEIC_EXTENSIONS)
+        )
+    return sorted(path for path in glob.glob(source) if os.path.isfile(path))
+
+def run_in_pool(task, items, max_workers=None, max_in_flight=None):
+    """
+    Run task(item) for every item on a process pool.
+
+    At most max_in_flight items are submitted at a time, so only that many
+    decoded images can be alive across the workers.
+
+    Args:
+        task (callable): Picklable module-level function taking one item
+        items (list): Work items
+        max_workers (int): Pool size (default: one worker per core)
+        max_in_flight (int): Submitted-but-unfinished limit (default: max_workers)
+
+    Yields:
+        tuple: (item, result) in completion order
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max(1, max_in_flight or max_workers)
+    pending = {}
+    queue = iter(items)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for item in queue:
+            pending[pool.submit(task, item)] = item
+            if len(pending) < max_in_flight:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+
+def _process_one(job):
+    """Worker: run the full pipeline for one file and describe the outcome."""
+    input_path, output_dir, save_intermediates, model_name, inference_size = job
+
+    # Imported here so each worker registers the HEIF opener itself
+    from process_img0829 import process_heic_photo
+
+    name = os.path.splitext(os.path.basename(input_path))[0]
+    output_prefix = os.path.join(output_dir, name) if output_dir else os.path.splitext(input_path)[0]
+
+    started = time.perf_counter()
+    try:
+        outputs = process_heic_photo(
+            input_path,
+            output_prefix,
+            save_intermediates=save_intermediates,
+            model_name=model_name,
+            inference_size=inference_size,
+        )
+        error = None if 'final' in outputs else "pipeline stopped before the final stage"
+    except Exception as e:
+        outputs, error = {}, str(e)
+
+    return {
+        'input': input_path,
+        'status': 'ok' if error is None else 'failed',
+        'outputs': outputs,
+        'seconds': round(time.perf_counter() - started, 3),
+        'error': error,
+        'pid': os.getpid(),
+    }
+
+def process_heic_batch(source, output_dir=None, max_workers=None, max_in_flight=None,
+                       save_intermediates=False, model_name=DEFAULT_MODEL,
+                       inference_size=None):
+    """
+    Process every HEIC matched by a directory or glob in parallel.
+
+    Args:
+        source (str): Directory, glob pattern or single file
+        output_dir (str): Where to write results (default: next to each input)
+        max_workers (int): Pool size (default: one worker per core)
+        max_in_flight (int): Images allowed in flight at once (default: max_workers)
+        save_intermediates (bool): Also write each intermediate stage
+        model_name (str): rembg model used by every worker
+        inference_size (int): Longest side segmentation runs at; masks are
+            upsampled to full resolution (None for full-resolution inference)
+
+    Returns:
+        list: One result dict per file, in input order
+    """
+    input_paths = find_heic_files(source)
+    if not input_paths:
+        print(f"No HEIC files found for: {source}")
+        return []
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    print(f"Processing {len(input_paths)} HEIC files with {max_workers or os.cpu_count()} workers...")
+    jobs = [(path, output_dir, save_intermediates, model_name, inference_size)
+            for path in input_paths]
+
+    results = {}
+    for job, result in run_in_pool(_process_one, jobs, max_workers, max_in_flight):
+        marker = "✅" if result['status'] == 'ok' else "❌"
+        print(f"{marker} {job[0]} ({result['seconds']:.1f}s)")
+        results[job[0]] = result
+
+    return [results[path] for path in input_paths]
+
+def print_batch_report(results):
+    """Print a one-line-per-file summary of a batch run."""
+    ok = sum(1 for result in results if result['status'] == 'ok')
+    print(f"\n{'='*60}")
+    print(f"Batch complete: {ok}/{len(results)} succeeded")
+    print(f"{'='*60}")
+    for result in results:
+        detail = result['outputs'].get('final') or result['error']
+        print(f"  {result['status']:<7} {result['seconds']:>7.1f}s  {result['input']} -> {detail}")
+
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else "."
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+
+    batch_results = process_heic_batch(source, output_dir, inference_size=LOW_RES_INFERENCE_SIZE)
+    if batch_results:
+        print_batch_report(batch_results)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Edge-inward content bounding box search
+Scans bands of rows and columns from each image edge towards the middle and
+stops at the first content, so only the white margins (plus one band per
+edge) are ever read. The result is exact
+"""
+
+import numpy as np
+
+# Rows or columns read per band
+BAND = 64
+
+def _white_lut(threshold, bands):
+    """Point table mapping content values to 255 and white to 0, per band."""
+    return [255 if value < threshold else 0 for value in range(256)] * bands
+
+def _band_extent(source, box, threshold, axis, lut):
+    """
+    First and last content line of a box, relative to the box.
+
+    PIL images are thresholded and measured with point() and getbbox() on a
+    cropped band, so the work stays in C; arrays are tested with NumPy.
+
+    Returns:
+        tuple: (first, last) row (axis 0) or column (axis 1), or None
+    """
+    left, top, right, bottom = box
+    if isinstance(source, np.ndarray):
+        pixels = source[top:bottom, left:right]
+        if pixels.ndim == 3:
+            hits = (pixels[:, :, :3] < threshold).any(axis=(1 - axis, 2))
+        else:
+            hits = (pixels < threshold).any(axis=1 - axis)
+        lines = np.flatnonzero(hits)
+        return (lines[0], lines[-1]) if lines.size else None
+
+    bbox = source.crop(box).point(lut).getbbox()
+    if bbox is None:
+        return None
+    return (bbox[1], bbox[3] - 1) if axis == 0 else (bbox[0], bbox[2] - 1)
+
+def _scan(source, threshold, axis, start, stop, span, band, lut):
+    """
+    First line (row for axis 0, column for axis 1) with content, scanning
+    from start towards stop one band at a time.
+
+    Args:
+        source: PIL image or uint8 numpy array (H, W[, channels])
+        threshold (int): Channel values at or above this count as white
+        axis (int): 0 to scan rows, 1 to scan columns
+        start (int): First line to read
+        stop (int): Line the scan stops before (may be below start to scan backwards)
+        span (tuple): (first, end) extent of each line along the other axis
+        band (int): Lines read per band
+        lut (list): Point table for PIL sources
+
+    Returns:
+        int: Index of the first content line, or None if there is none
+    """
+    step = band if stop >= start else -band
+    for near in range(start, stop, step):
+        far = near + step
+        far = min(far, stop) if step > 0 else max(far, stop)
+        low, high = (near, far) if step > 0 else (far + 1, near + 1)
+
+        box = (span[0], low, span[1], high) if axis == 0 else (low, span[0], high, span[1])
+        extent = _band_extent(source, box, threshold, axis, lut)
+        if extent is not None:
+            return low + (extent[0] if step > 0 else extent[1])
+    return None
+
+def content_bbox(source, threshold=250, band=BAND):
+    """
+    Bounding box of the non-white content of an image.
+
+    Rows are read in bands from the top and bottom edges until content is
+    found, then columns from the left and right edges within those rows.
+
+    Args:
+        source: PIL image or uint8 numpy array (H, W[, channels])
+        threshold (int): Channel values at or above this count as white
+        band (int): Rows or columns read at a time
+
+    Returns:
+        tuple: (left, top, right, bottom) with exclusive right/bottom, like
+            Image.getbbox, or None if no content was found
+    """
+    lut = None
+    if isinstance(source, np.ndarray):
+        height, width = source.shape[:2]
+    else:
+        # getbbox only looks at alpha for RGBA, so test the colour bands alone
+        if source.mode != 'L':
+            source = source.convert('RGB')
+        width, height = source.size
+        lut = _white_lut(threshold, len(source.getbands()))
+
+    top = _scan(source, threshold, 0, 0, height, (0, width), band, lut)
+    if top is None:
+        return None
+    bottom = _scan(source, threshold, 0, height - 1, top - 1, (0, width), band, lut) + 1
+    left = _scan(source, threshold, 1, 0, width, (top, bottom), band, lut)
+    right = _scan(source, threshold, 1, width - 1, left - 1, (top, bottom), band, lut) + 1
+
+    return int(left), int(top), int(right), int(bottom)
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Benchmark harness for the image-processing entry points
+Generates synthetic inputs, times each function with warm-up and repeats,
+records tracemalloc and RSS peaks, and compares against a saved baseline.
+Runs offline; rembg is never loaded by the benchmarked functions
+"""
+
+from PIL import Image
+import argparse
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ALL_SIZES_MP = (1, 4, 12, 24, 48)
+DEFAULT_SIZES_MP = (1, 4, 12)
+DEFAULT_BASELINE = "benchmark_baseline.json"
+# Median slow-down (as a fraction) reported as a regression
+REGRESSION_THRESHOLD = 0.10
+
+def size_for_megapixels(megapixels, aspect=4 / 3):
+    """
+    Width and height of a landscape image with the given pixel count.
+
+    Args:
+        megapixels (float): Target size in millions of pixels
+        aspect (float): Width / height
+
+    Returns:
+        tuple: (width, height)
+    """
+    height = int(math.sqrt(megapixels * 1_000_000 / aspect))
+    return int(height * aspect), height
+
+def _subject_alpha(size, softness=0.02):
+    """Soft-edged elliptical subject mask (float 0..1) centred in the frame."""
+    width, height = size
+    yy, xx = np.ogrid[:height, :width]
+    distance = np.hypot((xx - width * 0.5) / (width * 0.3), (yy - height * 0.55) / (height * 0.4))
+    return np.clip((1.0 - distance) / softness, 0.0, 1.0).astype(np.float32)
+
+def photographic_noise(size, seed=0):
+    """
+    RGB image with smooth colour gradients and sensor-like noise.
+
+    Args:
+        size (tuple): (width, height)
+        seed (int): Random seed
+
+    Returns:
+        PIL.Image: RGB image
+    """
+    width, height = size
+    rng = np.random.default_rng(seed)
+    data = np.empty((height, width, 3), dtype=np.uint8)
+    x = np.linspace(0, 1, width, dtype=np.float32)
+    for top in range(0, height, 256):
+        bottom = min(top + 256, height)
+        y = np.linspace(top / height, bottom / height, bottom - top, dtype=np.float32)[:, np.newaxis]
+        shape = (bottom - top, width)
+        base = np.stack([
+            np.broadcast_to(60 + 140 * x, shape),
+            np.broadcast_to(90 + 100 * y, shape),
+            180 - 90 * x * y,
+        ], axis=2)
+        base += rng.normal(0, 12, base.shape).astype(np.float32)
+        data[top:bottom] = np.clip(base, 0, 255).astype(np.uint8)
+    return Image.fromarray(data, 'RGB')
+
+def flat_backdrop(size, backdrop=(255, 255, 255), subject=(70, 50, 40), seed=0):
+    """
+    Subject on a plain backdrop, as shot for portraits.
+
+    Args:
+        size (tuple): (width, height)
+        backdrop (tuple): RGB backdrop colour
+        subject (tuple): RGB subject colour
+        seed (int): Random seed for subject texture
+
+    Returns:
+        PIL.Image: RGB image
+    """
+    rng = np.random.default_rng(seed)
+    alpha = _subject_alpha(size)[:, :, np.newaxis]
+    texture = rng.normal(0, 10, alpha.shape[:2] + (3,)).astype(np.float32)
+    data = np.asarray(backdrop, np.float32) * (1 - alpha) + (np.asarray(subject, np.float32) + texture) * alpha
+    return Image.fromarray(np.clip(data, 0, 255).astype(np.uint8), 'RGB')
+
+def alpha_subject(size, seed=0):
+    """
+    RGBA cutout: a textured subject on a fully transparent background.
+
+    Args:
+        size (tuple): (width, height)
+        seed (int): Random seed
+
+    Returns:
+        PIL.Image: RGBA image
+    """
+    img = photographic_noise(size, seed).convert('RGBA')
+    img.putalpha(Image.fromarray((_subject_alpha(size) * 255).astype(np.uint8), 'L'))
+    return img
+
+INPUT_GENERATORS = {
+    "photo": photographic_noise,
+    "backdrop": flat_backdrop,
+    "cutout": alpha_subject,
+}
+
+def _join(inputs, output_path):
+    from join_images import join_images_horizontally
+    return join_images_horizontally(inputs["photo"], output_path)
+
+def _seamless(inputs, output_path):
+    from create_seamless_blend import create_seamless_blend
+    return create_seamless_blend(inputs["photo"], output_path)
+
+def _fade(inputs, output_path):
+    from fade_combined_image import fade_image
+    return fade_image(inputs["photo"][0], output_path, 0.7)
+
+def _manual_removal(inputs, output_path):
+    from remove_background import remove_background_manual
+    return remove_background_manual(inputs["backdrop"][0], output_path)
+
+def _smart_crop(inputs, output_path):
+    from crop_photo import smart_crop_edges
+    return smart_crop_edges(inputs["backdrop"][0], output_path)
+
+def _natural_padding(inputs, output_path):
+    from natural_photo import add_natural_padding
+    return add_natural_padding(inputs["cutout"][0], output_path)
+
+# name -> (function, {input kind: number of images})
+BENCHMARKS = {
+    "join_images_horizontally": (_join, {"photo": 3}),
+    "create_seamless_blend": (_seamless, {"photo": 3}),
+    "fade_image": (_fade, {"photo": 1}),
+    "remove_background_manual": (_manual_removal, {"backdrop": 1}),
+    "smart_crop_edges": (_smart_crop, {"backdrop": 1}),
+    "add_natural_padding": (_natural_padding, {"cutout": 1}),
+}
+
+def generate_inputs(megapixels, directory):
+    """
+    Write every synthetic input needed at one size, as PNG files.
+
+    Args:
+        megapixels (float): Image size in millions of pixels
+        directory (str): Where to write the files
+
+    Returns:
+        dict: Input kind -> list of file paths
+    """
+    size = size_for_megapixels(megapixels)
+    needed = {}
+    for _, kinds in BENCHMARKS.values():
+        for kind, count in kinds.items():
+            needed[kind] = max(needed.get(kind, 0), count)
+
+    inputs = {}
+    for kind, count in needed.items():
+        inputs[kind] = []
+        for index in range(count):
+            path = os.path.join(directory, f"{kind}_{megapixels}mp_{index}.png")
+            if not os.path.exists(path):
+                INPUT_GENERATORS[kind](size, seed=index).save(path, 'PNG', compress_level=1)
+            inputs[kind].append(path)
+    return inputs
+
+def _peak_rss_mb():
+    """Peak resident set size of this process, in MB."""
+    # VmHWM starts fresh in a spawned process; ru_maxrss carries over the
+    # parent's peak across exec on Linux, so it is only the fallback
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _run_case(name, inputs, output_path, warmup, repeats, resize_cache_dir=None):
+    """
+    Worker: time one benchmark in a fresh process and measure its memory.
+
+    The on-disk resize cache lives in resize_cache_dir, or is off when None.
+    """
+    function = BENCHMARKS[name][0]
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from resize_cache import configure_resize_cache
+    if resize_cache_dir:
+        configure_resize_cache(resize_cache_dir)
+    else:
+        configure_resize_cache(max_bytes=0)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        rss_before = _peak_rss_mb()
+        for _ in range(warmup):
+            function(inputs, output_path)
+
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = function(inputs, output_path)
+            timings.append(time.perf_counter() - started)
+        rss_peak = _peak_rss_mb()
+
+        tracemalloc.start()
+        function(inputs, output_path)
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "ok": bool(result),
+        "median_s": round(statistics.median(timings), 4),
+        "min_s": round(min(timings), 4),
+        "repeats": repeats,
+        "tracemalloc_peak_mb": round(traced_peak / (1024 * 1024), 1),
+        "peak_rss_mb": round(rss_peak, 1),
+        "rss_growth_mb": round(rss_peak - rss_before, 1),
+    }
+
+def run_benchmarks(sizes=DEFAULT_SIZES_MP, names=None, warmup=1, repeats=3, work_dir=None,
+                   resize_cache=False):
+    """
+    Run the benchmarks, each case in its own process so memory peaks are clean.
+
+    Args:
+        sizes (tuple): Input sizes in megapixels
+        names (list): Benchmark names (default: all of BENCHMARKS)
+        warmup (int): Untimed runs before timing
+        repeats (int): Timed runs per case
+        work_dir (str): Where inputs and outputs go (default: a temp directory)
+        resize_cache (bool): Let repeats hit the on-disk resize cache (starts
+            empty); off by default so every run measures the full resize
+
+    Returns:
+        dict: Environment details and one result per (benchmark, size)
+    """
+    names = names or list(BENCHMARKS)
+    context = multiprocessing.get_context("spawn")
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "pillow": Image.__version__,
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "resize_cache": resize_cache,
+        },
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as directory:
+        resize_cache_dir = os.path.join(directory, "resize_cache") if resize_cache else None
+
+        for megapixels in sizes:
+            print(f"Generating {megapixels} MP inputs...")
+            inputs = generate_inputs(megapixels, directory)
+
+            for name in names:
+                output_path = os.path.join(directory, f"out_{name}.png")
+                with context.Pool(1) as pool:
+                    result = pool.apply(_run_case, (name, inputs, output_path, warmup, repeats,
+                                                    resize_cache_dir))
+                result = {"name": name, "megapixels": megapixels, **result}
+                report["results"].append(result)
+
+                status = "" if result["ok"] else "  (function reported failure)"
+                print(f"  {name:<26} {result['median_s']:>8.3f}s  "
+                      f"traced {result['tracemalloc_peak_mb']:>7.1f} MB  "
+                      f"RSS {result['peak_rss_mb']:>7.1f} MB{status}")
+
+    return report
+
+def compare_to_baseline(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Print how each result moved against a baseline report.
+
+    Args:
+        report (dict): Current results from run_benchmarks
+        baseline (dict): Earlier results from run_benchmarks
+        threshold (float): Median slow-down counted as a regression
+
+    Returns:
+        list: (name, megapixels, ratio) for every regression
+    """
+    previous = {(entry["name"], entry["megapixels"]): entry for entry in baseline["results"]}
+    regressions = []
+
+    print(f"\n{'benchmark':<26} {'MP':>4} {'baseline':>10} {'now':>10} {'change':>8}")
+    for entry in report["results"]:
+        old = previous.get((entry["name"], entry["megapixels"]))
+        if old is None:
+            continue
+        ratio = entry["median_s"] / max(old["median_s"], 1e-9)
+        marker = ""
+        if ratio > 1 + threshold:
+            marker = "  ❌ slower"
+            regressions.append((entry["name"], entry["megapixels"], ratio))
+        elif ratio < 1 - threshold:
+            marker = "  ✅ faster"
+        print(f"{entry['name']:<26} {entry['megapixels']:>4} {old['median_s']:>9.3f}s "
+              f"{entry['median_s']:>9.3f}s {100 * (ratio - 1):>+7.0f}%{marker}")
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES_MP)),
+                        help="Comma-separated megapixel sizes, or 'all' for 1-48 MP")
+    parser.add_argument("--only", help="Comma-separated benchmark names")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write these results as the new baseline")
+    parser.add_argument("--output", help="Also write the results JSON here")
+    parser.add_argument("--resize-cache", action="store_true",
+                        help="Time with the on-disk resize cache enabled")
+    args = parser.parse_args()
+
+    sizes = ALL_SIZES_MP if args.sizes == "all" else tuple(float(s) if "." in s else int(s)
+                                                           for s in args.sizes.split(","))
+    names = args.only.split(",") if args.only else None
+    unknown = set(names or ()) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    report = run_benchmarks(sizes, names, args.warmup, args.repeats, resize_cache=args.resize_cache)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        print(f"\nBaseline written to: {args.baseline}")
+        return 0
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            regressions = compare_to_baseline(report, json.load(baseline_file))
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {REGRESSION_THRESHOLD:.0%}")
+            return 1
+        print("\n✅ No regressions")
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
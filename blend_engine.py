@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Shared seam-blending engine for the panorama scripts
+Builds feather ramps as NumPy arrays and composites only the overlap columns
+"""
+
+from PIL import Image
+import numpy as np
+
+def feather_ramp(length, blend_width, curve="linear"):
+    """
+    Build a rising alpha ramp for a feathered edge.
+
+    Args:
+        length (int): Number of columns in the ramp
+        blend_width (int): Width of the full blend area
+        curve (str): 'linear' or 'sqrt' (the smoother ** 0.5 transition)
+
+    Returns:
+        np.ndarray: uint8 alpha values, one per column
+    """
+    ratio = np.arange(length, dtype=np.float64) / blend_width
+    if curve == "sqrt":
+        ratio = ratio ** 0.5
+    elif curve != "linear":
+        raise ValueError(f"Unknown ramp curve: {curve}")
+    return (255 * ratio).astype(np.uint8)
+
+def feather_columns(width, blend_width, left=True, right=False, curve="linear"):
+    """
+    Build the per-column alpha profile of a tile with feathered edges.
+
+    The left edge rises from 0 over the first blend_width columns, the right
+    edge falls towards 0 over the last blend_width columns. Where both ramps
+    cover the same column the smaller alpha wins.
+
+    Args:
+        width (int): Width of the tile
+        blend_width (int): Width of the blending area
+        left (bool): Feather the left edge
+        right (bool): Feather the right edge
+        curve (str): 'linear' or 'sqrt'
+
+    Returns:
+        np.ndarray: uint8 alpha values, one per column
+    """
+    alpha = np.full(width, 255, dtype=np.uint8)
+    if blend_width <= 0:
+        return alpha
+
+    if left:
+        n = min(blend_width, width)
+        alpha[:n] = feather_ramp(n, blend_width, curve)
+
+    if right:
+        start = max(0, width - blend_width)
+        # Distance from the right edge runs blend_width..1 across the band
+        distance = np.arange(width - start, 0, -1, dtype=np.float64) / blend_width
+        if curve == "sqrt":
+            distance = distance ** 0.5
+        falling = (255 * distance).astype(np.uint8)
+        alpha[start:] = np.minimum(alpha[start:], falling)
+
+    return alpha
+
+def composite_columns(canvas, tile, x, alpha_cols):
+    """
+    Paste a tile onto the canvas using a per-column alpha profile.
+
+    Fully opaque columns are pasted directly; only the feathered columns are
+    blended, so the cost of a seam is proportional to the blend width rather
+    than the size of the tile.
+
+    Args:
+        canvas (PIL.Image): RGB canvas, modified in place
+        tile (PIL.Image): Image to place on the canvas
+        x (int): Left position of the tile on the canvas
+        alpha_cols (np.ndarray): uint8 alpha per tile column
+    """
+    width, height = tile.size
+    height = min(height, canvas.height)
+
+    opaque = np.flatnonzero(alpha_cols == 255)
+    if opaque.size:
+        solid_start, solid_end = int(opaque[0]), int(opaque[-1]) + 1
+    else:
+        solid_start = solid_end = width
+
+    # Opaque middle section goes straight through Pillow's paste
+    if solid_end > solid_start:
+        canvas.paste(tile.crop((solid_start, 0, solid_end, height)), (x + solid_start, 0))
+
+    # Feathered edges are blended only over their own columns
+    for band_start, band_end in ((0, solid_start), (solid_end, width)):
+        left = max(band_start, -x)
+        right = min(band_end, canvas.width - x)
+        if right <= left:
+            continue
+
+        box = (x + left, 0, x + right, height)
+        src = np.asarray(tile.crop((left, 0, right, height)).convert("RGB"), dtype=np.uint16)
+        dst = np.asarray(canvas.crop(box), dtype=np.uint16)
+
+        a = alpha_cols[left:right].astype(np.uint16)[np.newaxis, :, np.newaxis]
+        blended = (src * a + dst * (255 - a) + 127) // 255
+        canvas.paste(Image.fromarray(blended.astype(np.uint8), "RGB"), box[:2])
+
+def blend_strip(canvas, tiles, blend_width, feather_right=False, curve="linear"):
+    """
+    Lay tiles out left to right with overlapping feathered seams.
+
+    Args:
+        canvas (PIL.Image): RGB canvas wide enough for the overlapped tiles
+        tiles (list): Images of equal height, in order
+        blend_width (int): Overlap between neighbouring tiles
+        feather_right (bool): Also fade each tile out on its right edge
+        curve (str): 'linear' or 'sqrt'
+
+    Returns:
+        PIL.Image: The canvas
+    """
+    current_x = 0
+    last = len(tiles) - 1
+
+    for i, tile in enumerate(tiles):
+        alpha_cols = feather_columns(
+            tile.width,
+            blend_width,
+            left=i > 0,
+            right=feather_right and i < last,
+            curve=curve,
+        )
+        composite_columns(canvas, tile, current_x, alpha_cols)
+        current_x += tile.width - blend_width
+
+    return canvas
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Incremental build of the derived site images
+Knows which script turns which files into which outputs, rebuilds a target
+only when the hashes of its inputs, parameters or code change, runs
+independent branches in parallel and leaves outputs with unchanged bytes
+untouched on disk
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+import argparse
+import ast
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from disk_cache import content_key, file_digest
+from resize_cache import configure_resize_cache
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = os.path.join(ROOT, ".cache", "build_state.json")
+SCRATCH_DIR = os.path.join(ROOT, ".cache", "build")
+# Targets run in scratch directories; keep the resize cache at the repo root
+RESIZE_CACHE_DIR = os.path.join(ROOT, ".cache", "resized")
+
+def code_files(*modules):
+    """
+    Repo source files that the given modules import, directly or not.
+
+    Imports inside functions count too, so lazily imported helpers are
+    included; modules that are not files in the repo (PIL, numpy) are not.
+
+    Args:
+        *modules (str): Module names, e.g. "join_images"
+
+    Returns:
+        tuple: Sorted file names relative to the repo root
+    """
+    found = set()
+    pending = list(modules)
+    while pending:
+        module = pending.pop()
+        path = f"{module}.py"
+        if path in found or not os.path.exists(os.path.join(ROOT, path)):
+            continue
+        found.add(path)
+
+        with open(os.path.join(ROOT, path)) as source:
+            tree = ast.parse(source.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                pending.extend(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                pending.append(node.module.split(".")[0])
+    return tuple(sorted(found))
+
+class Target:
+    """
+    One build step: a script function that turns input files into outputs.
+
+    The action runs in a scratch directory holding links to its inputs, so
+    scripts that read and write fixed file names work unchanged.
+
+    Args:
+        name (str): Unique target name
+        inputs (list): Input files, relative to the repo root
+        outputs (list): Files the action writes, relative to the repo root
+        action (callable): Module-level function(inputs, params) returning truthy on success
+        params (dict): JSON-serialisable parameters, part of the signature
+        code (tuple): Source files whose edits should trigger a rebuild
+            (see code_files)
+    """
+
+    def __init__(self, name, inputs, outputs, action, params=None, code=()):
+        self.name = name
+        self.inputs = [os.path.normpath(path) for path in inputs]
+        self.outputs = [os.path.normpath(path) for path in outputs]
+        self.action = action
+        self.params = params or {}
+        self.code = tuple(code)
+
+    def signature(self):
+        """Hash of everything that determines the outputs."""
+        digests = [f"{path}={file_digest(os.path.join(ROOT, path))}" for path in self.inputs + list(self.code)]
+        return content_key(self.name, json.dumps(self.params, sort_keys=True), *digests)
+
+def _fade_sources(inputs, params):
+    from create_faded_images import create_faded_variants
+    variants = [tuple(variant) for variant in params["variants"]]
+    return bool(create_faded_variants(inputs[0], variants))
+
+def _menu_strip(inputs, params):
+    from create_menu_backgrounds import create_horizontal_strip, create_scrolling_background
+    strip_img, strip_width = create_horizontal_strip(params["base_name"], params["menu_height"],
+                                                     profile=params["profile"])
+    if not strip_img:
+        return False
+    return create_scrolling_background(params["base_name"], strip_img, strip_width, params["menu_height"],
+                                       profile=params["profile"], single_period=params["single_period"])
+
+def _menu_combined(inputs, params):
+    from create_menu_backgrounds import create_combined_scroll_background
+    combined_file, _ = create_combined_scroll_background(params["menu_height"], params["profile"],
+                                                         params["single_period"])
+    return combined_file
+
+def _join(inputs, params):
+    from join_images import join_images_horizontally
+    return join_images_horizontally(inputs, params["output"])
+
+def _fade_combined(inputs, params):
+    from fade_combined_image import fade_image
+    return fade_image(inputs[0], params["output"], params["opacity"])
+
+def _seamless(inputs, params):
+    from create_seamless_blend import create_advanced_blend, create_seamless_blend
+    return (create_seamless_blend(inputs, params["basic"], blend_width=params["blend_width"])
+            and create_advanced_blend(inputs, params["advanced"]))
+
+def _seamless_all(inputs, params):
+    from create_seamless_all import create_seamless_blend_all
+    return create_seamless_blend_all(inputs, params["output"], blend_width=params["blend_width"])
+
+def default_targets():
+    """
+    The site's asset graph.
+
+    sources -> *_faded_*.png -> *_menu_strip.png / *_menu_scroll_bg.png
+    -> menu_combined_scroll_bg.png, and the Screenshot/OIG sources -> the
+    join and blend outputs.
+
+    Returns:
+        list: Targets in declaration order
+    """
+    from create_faded_images import FADE_CONFIGS, FADE_IMAGES
+    from create_menu_backgrounds import MENU_HEIGHT, MENU_IMAGES, MENU_PROFILE, SINGLE_PERIOD
+    from join_images import join_image_files
+
+    targets = []
+    menu = {"menu_height": MENU_HEIGHT, "profile": MENU_PROFILE, "single_period": SINGLE_PERIOD}
+    period_json = (lambda png: [png, png[:-4] + ".json"] if SINGLE_PERIOD else [png])
+
+    for image_file in FADE_IMAGES:
+        base_name = os.path.splitext(image_file)[0]
+        variants = [(f"{base_name}{suffix}.png", opacity, brightness)
+                    for suffix, opacity, brightness in FADE_CONFIGS]
+        targets.append(Target(
+            f"fade:{base_name}", [image_file], [path for path, _, _ in variants], _fade_sources,
+            {"variants": variants}, code=code_files("create_faded_images"),
+        ))
+
+    menu_code = code_files("create_menu_backgrounds")
+    for base_name in MENU_IMAGES:
+        faded = [f"{base_name}{suffix}.png" for suffix, _, _ in FADE_CONFIGS]
+        targets.append(Target(
+            f"menu-strip:{base_name}", faded,
+            [f"{base_name}_menu_strip.png"] + period_json(f"{base_name}_menu_scroll_bg.png"),
+            _menu_strip, dict(menu, base_name=base_name), code=menu_code,
+        ))
+
+    targets.append(Target(
+        "menu-combined", [f"{base_name}_menu_strip.png" for base_name in MENU_IMAGES],
+        period_json("menu_combined_scroll_bg.png"), _menu_combined, menu, code=menu_code,
+    ))
+
+    blend_sources = sorted(glob.glob(os.path.join(ROOT, "Screenshot 2025-09-14 at *.png")))
+    blend_sources += sorted(glob.glob(os.path.join(ROOT, "OIG*.jpeg")))
+    blend_sources = [os.path.relpath(path, ROOT) for path in blend_sources]
+
+    targets.append(Target(
+        "join", join_image_files(ROOT), ["combined_images_horizontal.png"], _join,
+        {"output": "combined_images_horizontal.png"}, code=code_files("join_images"),
+    ))
+    targets.append(Target(
+        "fade-combined", ["combined_images_horizontal.png"], ["combined_images_horizontal_faded.png"],
+        _fade_combined, {"output": "combined_images_horizontal_faded.png", "opacity": 0.6},
+        code=code_files("fade_combined_image"),
+    ))
+    targets.append(Target(
+        "seamless", blend_sources,
+        ["combined_images_seamless.png", "combined_images_seamless_advanced.png"], _seamless,
+        {"basic": "combined_images_seamless.png", "advanced": "combined_images_seamless_advanced.png",
+         "blend_width": 120},
+        code=code_files("create_seamless_blend"),
+    ))
+    targets.append(Target(
+        "seamless-all", blend_sources, ["combined_images_seamless_all.png"], _seamless_all,
+        {"output": "combined_images_seamless_all.png", "blend_width": 120},
+        code=code_files("create_seamless_all"),
+    ))
+
+    return targets
+
+def _run_target(target):
+    """
+    Worker: run one target in a scratch directory and publish changed outputs.
+
+    Returns:
+        dict: Output digests plus the lists of written and unchanged outputs
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    configure_resize_cache(RESIZE_CACHE_DIR)
+    os.makedirs(SCRATCH_DIR, exist_ok=True)
+    scratch = tempfile.mkdtemp(prefix=target.name.replace(":", "_") + "-", dir=SCRATCH_DIR)
+    previous_dir = os.getcwd()
+
+    try:
+        for path in target.inputs:
+            link = os.path.join(scratch, path)
+            os.makedirs(os.path.dirname(link), exist_ok=True)
+            os.symlink(os.path.join(ROOT, path), link)
+
+        os.chdir(scratch)
+        try:
+            ok = target.action(target.inputs, target.params)
+        finally:
+            os.chdir(previous_dir)
+
+        missing = [path for path in target.outputs if not os.path.exists(os.path.join(scratch, path))]
+        if not ok or missing:
+            raise RuntimeError("action failed" + (f", missing {', '.join(missing)}" if missing else ""))
+
+        result = {"outputs": {}, "written": [], "unchanged": []}
+        for path in target.outputs:
+            built = os.path.join(scratch, path)
+            destination = os.path.join(ROOT, path)
+            digest = file_digest(built)
+            result["outputs"][path] = digest
+
+            # Leave identical files alone so their mtime (and caches keyed on it) survive
+            if os.path.exists(destination) and file_digest(destination) == digest:
+                result["unchanged"].append(path)
+            else:
+                os.replace(built, destination)
+                result["written"].append(path)
+        return result
+
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+class InlineExecutor:
+    """Executor that runs each target immediately in this process, keeping its caches warm."""
+
+    def submit(self, function, *args):
+        future = Future()
+        try:
+            future.set_result(function(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+def load_state(path=STATE_PATH):
+    """Read the per-target signatures and output digests of the last build."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as state_file:
+        return json.load(state_file)
+
+def save_state(state, path=STATE_PATH):
+    """Write the build state atomically."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as state_file:
+        json.dump(state, state_file, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+def is_up_to_date(target, signature, state):
+    """True when the last build used this signature and its outputs are still intact."""
+    entry = state.get(target.name)
+    if not entry or entry.get("signature") != signature:
+        return False
+    for path in target.outputs:
+        full_path = os.path.join(ROOT, path)
+        if not os.path.exists(full_path) or file_digest(full_path) != entry["outputs"].get(path):
+            return False
+    return True
+
+def build(targets=None, only=None, force=False, max_workers=None, dry_run=False, in_process=False):
+    """
+    Bring the requested targets (and what they depend on) up to date.
+
+    Args:
+        targets (list): Target graph (default: default_targets())
+        only (list): Target names to build (default: all)
+        force (bool): Rebuild even when signatures match
+        max_workers (int): Parallel targets (default: one per core)
+        dry_run (bool): Only report what would be rebuilt; targets fed by a
+            target that would rebuild are reported as rebuilding too
+        in_process (bool): Run targets one at a time in this process
+
+    Returns:
+        dict: Status per target name: built, up-to-date, would rebuild,
+            skipped or failed
+    """
+    targets = targets or default_targets()
+    by_name = {target.name: target for target in targets}
+    producers = {path: target.name for target in targets for path in target.outputs}
+    depends_on = {
+        target.name: {producers[path] for path in target.inputs if path in producers}
+        for target in targets
+    }
+
+    wanted = set(only or by_name)
+    unknown = wanted - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown targets: {', '.join(sorted(unknown))}")
+    pending = list(wanted)
+    while pending:
+        for dependency in depends_on[pending.pop()]:
+            if dependency not in wanted:
+                wanted.add(dependency)
+                pending.append(dependency)
+
+    state = load_state()
+    status = {}
+    running = {}
+
+    def ready():
+        return [name for name in by_name
+                if name in wanted and name not in status and name not in running.values()
+                and all(status.get(dep) in ("built", "up-to-date", "would rebuild")
+                        for dep in depends_on[name])]
+
+    def blocked():
+        for name in by_name:
+            if name in wanted and name not in status and any(
+                status.get(dep) in ("failed", "skipped") for dep in depends_on[name]
+            ):
+                status[name] = "skipped"
+                print(f"⏭️  {name}: skipped (an input target did not build)")
+                return True
+        return False
+
+    executor = InlineExecutor() if in_process else ProcessPoolExecutor(max_workers=max_workers)
+    with executor as pool:
+        while True:
+            settled = len(status)
+            for name in ready():
+                target = by_name[name]
+                if any(status[dep] == "would rebuild" for dep in depends_on[name]):
+                    # Its inputs would change, so its signature cannot be checked yet
+                    status[name] = "would rebuild"
+                    print(f"🔨 {name}: would rebuild (an input target would rebuild)")
+                    continue
+
+                missing = [path for path in target.inputs if not os.path.exists(os.path.join(ROOT, path))]
+                if missing:
+                    status[name] = "skipped"
+                    print(f"⏭️  {name}: missing inputs {', '.join(missing)}")
+                    continue
+
+                signature = target.signature()
+                if not force and is_up_to_date(target, signature, state):
+                    status[name] = "up-to-date"
+                    print(f"✔️  {name}: up to date")
+                    continue
+
+                if dry_run:
+                    status[name] = "would rebuild"
+                    print(f"🔨 {name}: would rebuild")
+                    continue
+
+                print(f"🔨 {name}: building...")
+                future = pool.submit(_run_target, target)
+                future.signature = signature
+                running[future] = name
+
+            if blocked() or len(status) > settled:
+                # Targets settled without running may have unblocked others
+                continue
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    status[name] = "failed"
+                    print(f"❌ {name}: {e}")
+                    continue
+
+                status[name] = "built"
+                state[name] = {"signature": future.signature, "outputs": result["outputs"]}
+                save_state(state)
+                unchanged = f", {len(result['unchanged'])} unchanged" if result["unchanged"] else ""
+                print(f"✅ {name}: {len(result['written'])} written{unchanged}")
+
+    return status
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("targets", nargs="*", help="Targets to build (default: all)")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if up to date")
+    parser.add_argument("--jobs", type=int, help="Targets built in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be rebuilt")
+    parser.add_argument("--list", action="store_true", help="List targets and their edges")
+    args = parser.parse_args()
+
+    if args.list:
+        for target in default_targets():
+            print(f"{target.name}")
+            print(f"    inputs:  {', '.join(target.inputs)}")
+            print(f"    outputs: {', '.join(target.outputs)}")
+        return 0
+
+    status = build(only=args.targets or None, force=args.force, max_workers=args.jobs,
+                   dry_run=args.dry_run)
+    counts = {}
+    for value in status.values():
+        counts[value] = counts.get(value, 0) + 1
+    print("\n" + ", ".join(f"{count} {value}" for value, count in sorted(counts.items())))
+    return 1 if "failed" in counts else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Colour-key masking engine
+Compares pixels against a key colour in row chunks using int32 squared
+distances from per-channel lookup tables, so no full-size float temporaries
+are created and nothing wraps
+"""
+
+import numpy as np
+
+DEFAULT_ROWS_PER_CHUNK = 64
+
+def _squared_tables(colour):
+    """Per-channel int32 tables of (value - key) ** 2 for every uint8 value."""
+    values = np.arange(256, dtype=np.int32)
+    return [(values - int(component)) ** 2 for component in colour[:3]]
+
+def _squared_distance(chunk, tables):
+    """Squared RGB distance of every pixel in a chunk to the key colour."""
+    distance = tables[0].take(chunk[:, :, 0])
+    distance += tables[1].take(chunk[:, :, 1])
+    distance += tables[2].take(chunk[:, :, 2])
+    return distance
+
+def colour_distance_mask(data, colour, tolerance, rows_per_chunk=DEFAULT_ROWS_PER_CHUNK, out=None):
+    """
+    Mark pixels within a Euclidean distance of a colour.
+
+    Args:
+        data (np.ndarray): uint8 image array (H, W, 3 or 4)
+        colour (sequence): RGB key colour
+        tolerance (float): Pixels strictly closer than this are marked
+        rows_per_chunk (int): Rows processed per step
+        out (np.ndarray): Optional bool (H, W) array to write into
+
+    Returns:
+        np.ndarray: bool mask, True where the pixel matches the key colour
+    """
+    height = data.shape[0]
+    if out is None:
+        out = np.empty(data.shape[:2], dtype=bool)
+
+    tables = _squared_tables(colour)
+    limit = tolerance * tolerance
+
+    for top in range(0, height, rows_per_chunk):
+        bottom = min(top + rows_per_chunk, height)
+        np.less(_squared_distance(data[top:bottom], tables), limit, out=out[top:bottom])
+
+    return out
+
+def key_out_colour(data, colour, tolerance, replacement, rows_per_chunk=DEFAULT_ROWS_PER_CHUNK):
+    """
+    Replace every pixel close to a key colour, in place.
+
+    Args:
+        data (np.ndarray): uint8 image array (H, W, 3 or 4), modified in place
+        colour (sequence): RGB key colour
+        tolerance (float): Pixels strictly closer than this are replaced
+        replacement (sequence): Value written to matching pixels (one per channel)
+        rows_per_chunk (int): Rows processed per step
+
+    Returns:
+        int: Number of pixels replaced
+    """
+    height = data.shape[0]
+    tables = _squared_tables(colour)
+    replacement = np.asarray(replacement, dtype=data.dtype)
+    limit = tolerance * tolerance
+    replaced = 0
+
+    for top in range(0, height, rows_per_chunk):
+        bottom = min(top + rows_per_chunk, height)
+        chunk = data[top:bottom]
+        mask = _squared_distance(chunk, tables) < limit
+        chunk[mask] = replacement
+        replaced += int(np.count_nonzero(mask))
+
+    return replaced
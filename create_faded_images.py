@@ -4,73 +4,92 @@ Script to create faded versions of images
 Creates light, medium, and heavy fade versions of specified images
 """
 
-from PIL import Image, ImageEnhance
 import os
+from fade_kernel import WHITE, fade_to_matte
+from image_resize import open_image
 
-def create_faded_image(input_path, output_path, opacity=0.6, brightness=1.1):
+# Images to process
+FADE_IMAGES = [
+    'climate1.png',
+    'photo_graph.png',
+    'photo_graph2.png'
+]
+
+# Fade configurations: (suffix, opacity, brightness)
+FADE_CONFIGS = [
+    ('_faded_light', 0.8, 1.1),
+    ('_faded_medium', 0.6, 1.05),
+    ('_faded_heavy', 0.4, 1.1)
+]
+
+def create_faded_variants(input_path, variants, matte=WHITE):
     """
-    Create a faded version of an image
+    Create several faded versions of an image from a single decode
     
     Args:
         input_path: Path to the original image
-        output_path: Path where faded image will be saved
-        opacity: Opacity level (0.0 to 1.0)
-        brightness: Brightness adjustment (1.0 = original)
+        variants: List of (output_path, opacity, brightness) tuples
+        matte: RGB colour the image is faded towards
+    
+    Returns:
+        list: Paths of the images that were written
     """
+    written = []
     try:
-        # Open the image
-        with Image.open(input_path) as img:
+        # Open and decode the image once
+        with open_image(input_path) as img:
             # Convert to RGBA if not already
             if img.mode != 'RGBA':
                 img = img.convert('RGBA')
+            else:
+                img.load()
+            # Checked once for all the variants
+            opaque = img.getextrema()[3] == (255, 255)
             
-            # Adjust brightness
-            enhancer = ImageEnhance.Brightness(img)
-            img = enhancer.enhance(brightness)
-            
-            # Create a white overlay for fade effect
-            overlay = Image.new('RGBA', img.size, (255, 255, 255, int(255 * (1 - opacity))))
-            
-            # Composite the images
-            faded_img = Image.alpha_composite(img, overlay)
-            
-            # Save the result
-            faded_img.save(output_path, 'PNG')
-            print(f"Created faded image: {output_path}")
+            for output_path, opacity, brightness in variants:
+                # Brightness and fade fused into one table lookup
+                faded_img = fade_to_matte(img, opacity, brightness, matte, opaque)
+                
+                # Save the result
+                faded_img.save(output_path, 'PNG')
+                print(f"Created faded image: {output_path}")
+                written.append(output_path)
             
     except FileNotFoundError:
         print(f"Error: Could not find image file {input_path}")
     except Exception as e:
         print(f"Error processing {input_path}: {str(e)}")
+    
+    return written
+
+def create_faded_image(input_path, output_path, opacity=0.6, brightness=1.1):
+    """
+    Create a faded version of an image
+    
+    Args:
+        input_path: Path to the original image
+        output_path: Path where faded image will be saved
+        opacity: Opacity level (0.0 to 1.0)
+        brightness: Brightness adjustment (1.0 = original)
+    """
+    create_faded_variants(input_path, [(output_path, opacity, brightness)])
 
 def main():
     """Main function to create faded versions of specified images"""
     
-    # List of images to process
-    images = [
-        'climate1.png',
-        'photo_graph.png', 
-        'photo_graph2.png'
-    ]
-    
-    # Fade configurations: (suffix, opacity, brightness)
-    fade_configs = [
-        ('_faded_light', 0.8, 1.1),
-        ('_faded_medium', 0.6, 1.05),
-        ('_faded_heavy', 0.4, 1.1)
-    ]
-    
-    for image_file in images:
+    for image_file in FADE_IMAGES:
         if os.path.exists(image_file):
             print(f"\nProcessing {image_file}...")
             
             # Get the base name without extension
             base_name = os.path.splitext(image_file)[0]
             
-            # Create different fade versions
-            for suffix, opacity, brightness in fade_configs:
-                output_file = f"{base_name}{suffix}.png"
-                create_faded_image(image_file, output_file, opacity, brightness)
+            # Create different fade versions from one decode
+            variants = [
+                (f"{base_name}{suffix}.png", opacity, brightness)
+                for suffix, opacity, brightness in FADE_CONFIGS
+            ]
+            create_faded_variants(image_file, variants)
         else:
             print(f"Warning: {image_file} not found in current directory")
     
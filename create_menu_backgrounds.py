@@ -5,15 +5,33 @@ Combines faded versions side by side and creates multiple copies for seamless sc
 """
 
 from PIL import Image
+import json
 import os
+from image_resize import resize_to_height
+from export_assets import export_and_record
+from encoder_profiles import save_png
 
-def create_horizontal_strip(base_name, menu_height=70):
+# Images with faded variants to lay out in the menu
+MENU_IMAGES = ['climate1', 'photo_graph', 'photo_graph2']
+
+# Menu height (matching your navbar height)
+MENU_HEIGHT = 70
+
+# Palette-quantized PNGs: the strips are small and heavily faded
+MENU_PROFILE = "palette-dither"
+
+# One seamless period per file; styles.css loops it with repeat-x
+SINGLE_PERIOD = True
+
+def create_horizontal_strip(base_name, menu_height=70, exact_decode=False, profile="default"):
     """
     Create a horizontal strip combining light, medium, heavy faded versions
     
     Args:
         base_name: Base name of the image (without extension)
         menu_height: Height of the menu container in pixels
+        exact_decode: Decode sources at full resolution instead of a reduced draft scale
+        profile: PNG encoder profile from encoder_profiles.ENCODER_PROFILES
     """
     try:
         # Load the three faded versions
@@ -22,14 +40,9 @@ def create_horizontal_strip(base_name, menu_height=70):
         heavy_img = Image.open(f"{base_name}_faded_heavy.png")
         
         # Resize all images to match menu height while maintaining aspect ratio
-        def resize_to_height(img, target_height):
-            aspect_ratio = img.width / img.height
-            new_width = int(target_height * aspect_ratio)
-            return img.resize((new_width, target_height), Image.Resampling.LANCZOS)
-        
-        light_resized = resize_to_height(light_img, menu_height)
-        medium_resized = resize_to_height(medium_img, menu_height)
-        heavy_resized = resize_to_height(heavy_img, menu_height)
+        light_resized = resize_to_height(light_img, menu_height, exact_decode)
+        medium_resized = resize_to_height(medium_img, menu_height, exact_decode)
+        heavy_resized = resize_to_height(heavy_img, menu_height, exact_decode)
         
         # Calculate total width
         total_width = light_resized.width + medium_resized.width + heavy_resized.width
@@ -47,7 +60,7 @@ def create_horizontal_strip(base_name, menu_height=70):
         
         # Save the single strip
         strip_filename = f"{base_name}_menu_strip.png"
-        strip.save(strip_filename, 'PNG')
+        save_png(strip, strip_filename, profile)
         print(f"Created menu strip: {strip_filename}")
         
         return strip, total_width
@@ -56,18 +69,47 @@ def create_horizontal_strip(base_name, menu_height=70):
         print(f"Error creating strip for {base_name}: {str(e)}")
         return None, 0
 
-def create_scrolling_background(base_name, strip_img, strip_width, menu_height=70, total_copies=5):
+def write_period_metadata(image_filename, period_width, menu_height):
+    """
+    Write the repeat period of a scrolling background next to it as JSON
+    
+    Args:
+        image_filename: The scrolling background PNG
+        period_width: Width of one seamless period in pixels
+        menu_height: Height of the background in pixels
+    """
+    metadata_filename = f"{os.path.splitext(image_filename)[0]}.json"
+    with open(metadata_filename, 'w') as metadata_file:
+        json.dump({
+            'image': image_filename,
+            'period_width': period_width,
+            'height': menu_height,
+        }, metadata_file, indent=2)
+    print(f"Wrote period metadata: {metadata_filename}")
+    return metadata_filename
+
+def create_scrolling_background(base_name, strip_img, strip_width, menu_height=70, total_copies=5,
+                                profile="default", single_period=False):
     """
     Create a long horizontal image with multiple copies for seamless scrolling
     
+    With single_period, only one copy is written together with a JSON file
+    holding the period width and height; the page loops it with
+    background-repeat instead of scrolling over pasted copies.
+    
     Args:
         base_name: Base name of the image
         strip_img: The single strip image
         strip_width: Width of a single strip
         menu_height: Height of the menu
         total_copies: Number of copies to create for seamless scrolling
+        profile: PNG encoder profile from encoder_profiles.ENCODER_PROFILES
+        single_period: Write one seamless period plus metadata instead of copies
     """
     try:
+        if single_period:
+            total_copies = 1
+        
         # Create a long image with multiple copies
         scroll_width = strip_width * total_copies
         scroll_bg = Image.new('RGBA', (scroll_width, menu_height), (255, 255, 255, 0))
@@ -79,18 +121,26 @@ def create_scrolling_background(base_name, strip_img, strip_width, menu_height=7
         
         # Save the scrolling background
         scroll_filename = f"{base_name}_menu_scroll_bg.png"
-        scroll_bg.save(scroll_filename, 'PNG')
+        save_png(scroll_bg, scroll_filename, profile)
         print(f"Created scrolling background: {scroll_filename}")
         
+        if single_period:
+            write_period_metadata(scroll_filename, strip_width, menu_height)
+        
         return scroll_filename
         
     except Exception as e:
         print(f"Error creating scrolling background for {base_name}: {str(e)}")
         return None
 
-def create_combined_scroll_background(menu_height=70):
+def create_combined_scroll_background(menu_height=70, profile="default", single_period=False):
     """
     Create a combined scrolling background using all three images
+    
+    Args:
+        menu_height: Height of the menu
+        profile: PNG encoder profile from encoder_profiles.ENCODER_PROFILES
+        single_period: Write one cycle plus period metadata instead of 3 cycles
     """
     try:
         # Load all individual strips
@@ -102,11 +152,12 @@ def create_combined_scroll_background(menu_height=70):
         total_width = climate_strip.width + photo1_strip.width + photo2_strip.width
         
         # Create multiple copies for smooth scrolling (3 complete cycles)
-        scroll_width = total_width * 3
+        cycles = 1 if single_period else 3
+        scroll_width = total_width * cycles
         combined_bg = Image.new('RGBA', (scroll_width, menu_height), (255, 255, 255, 0))
         
         # Paste the pattern multiple times
-        for cycle in range(3):
+        for cycle in range(cycles):
             x_offset = cycle * total_width
             
             # Climate strip
@@ -122,9 +173,12 @@ def create_combined_scroll_background(menu_height=70):
         
         # Save the combined scrolling background
         combined_filename = "menu_combined_scroll_bg.png"
-        combined_bg.save(combined_filename, 'PNG')
+        save_png(combined_bg, combined_filename, profile)
         print(f"Created combined scrolling background: {combined_filename}")
         
+        if single_period:
+            write_period_metadata(combined_filename, total_width, menu_height)
+        
         return combined_filename, total_width
         
     except Exception as e:
@@ -136,30 +190,30 @@ def main():
     
     print("Creating horizontal scrolling backgrounds for menu section...")
     
-    # Menu height (matching your navbar height)
-    menu_height = 70
-    
-    # Process each image
-    images = ['climate1', 'photo_graph', 'photo_graph2']
+    menu_height = MENU_HEIGHT
+    profile = MENU_PROFILE
+    single_period = SINGLE_PERIOD
     
     strips = []
     
-    for base_name in images:
+    # Process each image
+    for base_name in MENU_IMAGES:
         print(f"\nProcessing {base_name}...")
         
         # Create horizontal strip
-        strip_img, strip_width = create_horizontal_strip(base_name, menu_height)
+        strip_img, strip_width = create_horizontal_strip(base_name, menu_height, profile=profile)
         
         if strip_img:
             strips.append((base_name, strip_img, strip_width))
             
             # Create scrolling background for individual image
-            create_scrolling_background(base_name, strip_img, strip_width, menu_height)
+            create_scrolling_background(base_name, strip_img, strip_width, menu_height,
+                                        profile=profile, single_period=single_period)
     
     # Create combined scrolling background
     if len(strips) == 3:
         print(f"\nCreating combined scrolling background...")
-        combined_file, pattern_width = create_combined_scroll_background(menu_height)
+        combined_file, pattern_width = create_combined_scroll_background(menu_height, profile, single_period)
         
         if combined_file:
             print(f"\n✅ Successfully created scrolling backgrounds!")
@@ -167,6 +221,7 @@ def main():
             print(f"- Individual strips: *_menu_strip.png")
             print(f"- Individual scrolling: *_menu_scroll_bg.png") 
             print(f"- Combined scrolling: {combined_file}")
+            export_and_record(combined_file)
             print(f"\nPattern width for CSS animation: {pattern_width}px")
             print(f"Menu height: {menu_height}px")
 
@@ -1,8 +1,13 @@
 from PIL import Image, ImageFilter
 import os
 import glob
+from blend_engine import blend_strip
+from background_generator import create_canvas
+from image_resize import resize_image
+from export_assets import export_and_record
 
-def create_seamless_blend_all(image_files, output_path, blend_width=100):
+def create_seamless_blend_all(image_files, output_path, blend_width=100, background=(255, 255, 255),
+                              exact_decode=False):
     """
     Combine all images horizontally with seamless blending at the edges
     
@@ -10,6 +15,8 @@ def create_seamless_blend_all(image_files, output_path, blend_width=100):
         image_files (list): List of image file paths
         output_path (str): Path to save the blended image
         blend_width (int): Width of the blending area between images
+        background: Canvas colour, or a list of (position, colour) gradient stops
+        exact_decode (bool): Decode JPEGs at full resolution instead of a reduced draft scale
     """
     try:
         print("Loading and processing ALL images for seamless blending...")
@@ -34,7 +41,7 @@ def create_seamless_blend_all(image_files, output_path, blend_width=100):
         for img in images:
             aspect_ratio = img.size[0] / img.size[1]
             new_width = int(max_height * aspect_ratio)
-            resized_img = img.resize((new_width, max_height), Image.Resampling.LANCZOS)
+            resized_img = resize_image(img, (new_width, max_height), exact_decode)
             resized_images.append(resized_img)
             print(f"Resized to: {new_width}x{max_height}")
         
@@ -43,33 +50,10 @@ def create_seamless_blend_all(image_files, output_path, blend_width=100):
         print(f"Total blended width: {total_width}x{max_height}")
         
         # Create the final canvas
-        final_image = Image.new('RGB', (total_width, max_height), (255, 255, 255))
+        final_image = create_canvas((total_width, max_height), background)
         
-        # Paste images with blending
-        current_x = 0
-        
-        for i, img in enumerate(resized_images):
-            if i == 0:
-                # First image - paste normally
-                final_image.paste(img, (current_x, 0))
-                current_x += img.size[0] - blend_width
-            else:
-                # Subsequent images - create blend mask
-                blend_mask = Image.new('L', img.size, 255)
-                
-                # Create gradient for left edge blending
-                for x in range(min(blend_width, img.size[0])):
-                    alpha = int(255 * (x / blend_width))
-                    for y in range(img.size[1]):
-                        blend_mask.putpixel((x, y), alpha)
-                
-                # Convert image to RGBA for blending
-                img_rgba = img.convert('RGBA')
-                img_rgba.putalpha(blend_mask)
-                
-                # Paste with blend
-                final_image.paste(img_rgba, (current_x, 0), img_rgba)
-                current_x += img.size[0] - blend_width
+        # Paste images with feathered left edges
+        blend_strip(final_image, resized_images, blend_width, curve="linear")
         
         # Apply subtle overall smoothing
         final_image = final_image.filter(ImageFilter.GaussianBlur(radius=0.5))
@@ -108,6 +92,7 @@ if __name__ == "__main__":
     if success:
         print("\n✨ Complete seamless blending finished!")
         print("File created: combined_images_seamless_all.png")
+        export_and_record("combined_images_seamless_all.png")
         print("This includes all screenshots and ALL OIG images with seamless transitions!")
     else:
         print("❌ Failed to create complete seamless blend")
@@ -1,8 +1,12 @@
 from PIL import Image, ImageFilter
 import os
 import glob
+from blend_engine import blend_strip
+from background_generator import create_canvas, create_linear_canvas
+from image_resize import resize_image
 
-def create_seamless_blend(image_files, output_path, blend_width=100):
+def create_seamless_blend(image_files, output_path, blend_width=100, background=(255, 255, 255),
+                          exact_decode=False):
     """
     Combine images horizontally with seamless blending at the edges
     
@@ -10,6 +14,8 @@ def create_seamless_blend(image_files, output_path, blend_width=100):
         image_files (list): List of image file paths
         output_path (str): Path to save the blended image
         blend_width (int): Width of the blending area between images
+        background: Canvas colour, or a list of (position, colour) gradient stops
+        exact_decode (bool): Decode JPEGs at full resolution instead of a reduced draft scale
     """
     try:
         print("Loading and processing images for seamless blending...")
@@ -25,54 +31,7 @@ def create_seamless_blend(image_files, output_path, blend_width=100):
             print("No images found!")
             return False
         
-        # Find the maximum height
-        max_height = max(img.size[1] for img in images)
-        print(f"Target height: {max_height}")
-        
-        # Resize all images to the same height while maintaining aspect ratio
-        resized_images = []
-        for img in images:
-            aspect_ratio = img.size[0] / img.size[1]
-            new_width = int(max_height * aspect_ratio)
-            resized_img = img.resize((new_width, max_height), Image.Resampling.LANCZOS)
-            resized_images.append(resized_img)
-            print(f"Resized to: {new_width}x{max_height}")
-        
-        # Calculate total width accounting for blend overlap
-        total_width = sum(img.size[0] for img in resized_images) - (blend_width * (len(resized_images) - 1))
-        print(f"Total blended width: {total_width}x{max_height}")
-        
-        # Create the final canvas
-        final_image = Image.new('RGB', (total_width, max_height), (255, 255, 255))
-        
-        # Paste images with blending
-        current_x = 0
-        
-        for i, img in enumerate(resized_images):
-            if i == 0:
-                # First image - paste normally
-                final_image.paste(img, (current_x, 0))
-                current_x += img.size[0] - blend_width
-            else:
-                # Subsequent images - create blend mask
-                blend_mask = Image.new('L', img.size, 255)
-                
-                # Create gradient for left edge blending
-                for x in range(min(blend_width, img.size[0])):
-                    alpha = int(255 * (x / blend_width))
-                    for y in range(img.size[1]):
-                        blend_mask.putpixel((x, y), alpha)
-                
-                # Convert image to RGBA for blending
-                img_rgba = img.convert('RGBA')
-                img_rgba.putalpha(blend_mask)
-                
-                # Paste with blend
-                final_image.paste(img_rgba, (current_x, 0), img_rgba)
-                current_x += img.size[0] - blend_width
-        
-        # Apply subtle overall smoothing
-        final_image = final_image.filter(ImageFilter.GaussianBlur(radius=0.5))
+        final_image = blend_images(images, blend_width, background, exact_decode)
         
         # Save the result
         final_image.save(output_path, 'PNG', quality=95)
@@ -84,9 +43,53 @@ def create_seamless_blend(image_files, output_path, blend_width=100):
         print(f"❌ Error creating blend: {e}")
         return False
 
-def create_advanced_blend(image_files, output_path):
+def blend_images(images, blend_width=100, background=(255, 255, 255), exact_decode=False):
+    """
+    Blend images side by side with feathered seams, in memory.
+    
+    Args:
+        images (list): PIL images, left to right
+        blend_width (int): Width of the blending area between images
+        background: Canvas colour, or a list of (position, colour) gradient stops
+        exact_decode (bool): Decode JPEGs at full resolution instead of a reduced draft scale
+    
+    Returns:
+        PIL.Image: Blended RGB image
+    """
+    # Find the maximum height
+    max_height = max(img.size[1] for img in images)
+    print(f"Target height: {max_height}")
+    
+    # Resize all images to the same height while maintaining aspect ratio
+    resized_images = []
+    for img in images:
+        aspect_ratio = img.size[0] / img.size[1]
+        new_width = int(max_height * aspect_ratio)
+        resized_img = resize_image(img, (new_width, max_height), exact_decode)
+        resized_images.append(resized_img)
+        print(f"Resized to: {new_width}x{max_height}")
+    
+    # Calculate total width accounting for blend overlap
+    total_width = sum(img.size[0] for img in resized_images) - (blend_width * (len(resized_images) - 1))
+    print(f"Total blended width: {total_width}x{max_height}")
+    
+    # Create the final canvas
+    final_image = create_canvas((total_width, max_height), background)
+    
+    # Paste images with feathered left edges
+    blend_strip(final_image, resized_images, blend_width, curve="linear")
+    
+    # Apply subtle overall smoothing
+    return final_image.filter(ImageFilter.GaussianBlur(radius=0.5))
+
+def create_advanced_blend(image_files, output_path, exact_decode=False):
     """
     Create an advanced blend with gradient transitions and color matching
+    
+    Args:
+        image_files (list): List of image file paths
+        output_path (str): Path to save the blended image
+        exact_decode (bool): Decode JPEGs at full resolution instead of a reduced draft scale
     """
     try:
         print("Creating advanced seamless blend...")
@@ -101,54 +104,20 @@ def create_advanced_blend(image_files, output_path):
         for img in images:
             aspect_ratio = img.size[0] / img.size[1]
             new_width = int(max_height * aspect_ratio)
-            resized_img = img.resize((new_width, max_height), Image.Resampling.LANCZOS)
+            resized_img = resize_image(img, (new_width, max_height), exact_decode)
             resized_images.append(resized_img)
         
         # Create panoramic blend
         blend_width = 150  # Wider blend area
         total_width = sum(img.size[0] for img in resized_images) - (blend_width * (len(resized_images) - 1))
         
-        # Create canvas with gradient background
-        final_image = Image.new('RGB', (total_width, max_height))
-        
-        # Create gradient background
-        for x in range(total_width):
-            color_ratio = x / total_width
-            bg_color = (
-                int(240 + 15 * color_ratio),  # Subtle color shift
-                int(245 + 10 * color_ratio),
-                int(250 + 5 * color_ratio)
-            )
-            for y in range(max_height):
-                final_image.putpixel((x, y), bg_color)
+        # Create canvas with subtle colour-shift gradient background
+        final_image = create_linear_canvas(
+            (total_width, max_height), (240, 245, 250), (255, 255, 255)
+        )
         
         # Blend images with feathered edges
-        current_x = 0
-        
-        for i, img in enumerate(resized_images):
-            # Create soft feather mask
-            mask = Image.new('L', img.size, 255)
-            
-            if i > 0:  # Left edge feathering
-                for x in range(min(blend_width, img.size[0])):
-                    alpha = int(255 * (x / blend_width) ** 0.5)  # Curve for smoother transition
-                    for y in range(img.size[1]):
-                        mask.putpixel((x, y), alpha)
-            
-            if i < len(resized_images) - 1:  # Right edge feathering
-                start_x = max(0, img.size[0] - blend_width)
-                for x in range(start_x, img.size[0]):
-                    alpha = int(255 * ((img.size[0] - x) / blend_width) ** 0.5)
-                    for y in range(img.size[1]):
-                        current_alpha = mask.getpixel((x, y))
-                        mask.putpixel((x, y), min(current_alpha, alpha))
-            
-            # Apply mask and paste
-            img_rgba = img.convert('RGBA')
-            img_rgba.putalpha(mask)
-            final_image.paste(img_rgba, (current_x, 0), img_rgba)
-            
-            current_x += img.size[0] - blend_width
+        blend_strip(final_image, resized_images, blend_width, feather_right=True, curve="sqrt")
         
         # Final smoothing filter
         final_image = final_image.filter(ImageFilter.GaussianBlur(radius=0.3))
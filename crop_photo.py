@@ -1,6 +1,6 @@
-from PIL import Image, ImageChops
-import numpy as np
+from PIL import Image
 import os
+from bbox_detect import content_bbox
 
 def auto_crop_whitespace(input_path, output_path=None, padding=20):
     """
@@ -35,17 +35,8 @@ def auto_crop_whitespace(input_path, output_path=None, padding=20):
         
         print("Detecting content boundaries...")
         
-        # Create a white image of the same size
-        white_bg = Image.new('RGB', img.size, (255, 255, 255))
-        
-        # Find difference between image and white background
-        diff = ImageChops.difference(img, white_bg)
-        
-        # Convert to grayscale and get bounding box
-        diff = diff.convert('L')
-        
-        # Get bounding box of non-white content
-        bbox = diff.getbbox()
+        # Get bounding box of non-white content (any channel below 255)
+        bbox = content_bbox(img, threshold=255)
         
         if bbox is None:
             print("No content found - image appears to be all white")
@@ -104,31 +95,25 @@ def smart_crop_edges(input_path, output_path=None, margin_percent=5):
         
         print(f"Opening {input_path}...")
         
-        # Open the image and convert to numpy array
+        # Open the image
         img = Image.open(input_path).convert('RGB')
-        img_array = np.array(img)
         
         print("Analyzing image content...")
         
         # Define white threshold (allow for slight variations)
         white_threshold = 250
         
-        # Find non-white pixels
-        non_white = (img_array[:, :, 0] < white_threshold) | \
-                   (img_array[:, :, 1] < white_threshold) | \
-                   (img_array[:, :, 2] < white_threshold)
+        # Find bounding box of non-white content, scanning in from the edges
+        bbox = content_bbox(img, threshold=white_threshold)
         
-        # Find bounding box of content
-        rows = np.any(non_white, axis=1)
-        cols = np.any(non_white, axis=0)
-        
-        if not np.any(rows) or not np.any(cols):
+        if bbox is None:
             print("No content found")
             return None
         
-        # Get content boundaries
-        top, bottom = np.where(rows)[0][[0, -1]]
-        left, right = np.where(cols)[0][[0, -1]]
+        # Get content boundaries (last content row/column, inclusive)
+        left, top, right, bottom = bbox
+        right -= 1
+        bottom -= 1
         
         # Calculate content dimensions
         content_width = right - left
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Size-capped on-disk cache with least-recently-used eviction
+Entries are plain files named by key; file mtime records the last use
+"""
+
+import hashlib
+import os
+import tempfile
+
+def content_key(*parts):
+    """
+    Hash any mix of bytes and str parts into a hex cache key.
+
+    Args:
+        *parts: bytes or str values that together identify an entry
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(len(part).to_bytes(8, "little"))
+        digest.update(part)
+    return digest.hexdigest()
+
+# (path, mtime, size) -> digest, so repeated lookups in one process skip rehashing
+_file_digests = {}
+
+def file_digest(path):
+    """
+    Hash a file's bytes.
+
+    Args:
+        path (str): File to hash
+
+    Returns:
+        str: Hex digest
+    """
+    stat = os.stat(path)
+    identity = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+    if identity in _file_digests:
+        return _file_digests[identity]
+
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as source:
+        for block in iter(lambda: source.read(1 << 20), b""):
+            digest.update(block)
+    _file_digests[identity] = digest.hexdigest()
+    return _file_digests[identity]
+
+def image_key(img, *params):
+    """
+    Build a cache key from decoded image pixels plus processing parameters.
+
+    Args:
+        img (PIL.Image): Decoded image
+        *params: Extra values (model name, options) that affect the result
+
+    Returns:
+        str: Hex digest
+    """
+    header = f"{img.mode}:{img.size[0]}x{img.size[1]}"
+    return content_key(header, img.tobytes(), *(str(param) for param in params))
+
+class DiskCache:
+    """
+    Directory of cached files limited to max_bytes in total.
+
+    Args:
+        directory (str): Where entries are stored (created on demand)
+        max_bytes (int): Size cap; least recently used entries are evicted
+        suffix (str): File extension for entries
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, suffix=".bin"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        # Running total of entry sizes, scanned from disk on the first put;
+        # writes by other processes are picked up at the next eviction scan
+        self._total_bytes = None
+
+    def path_for(self, key):
+        """Return the file path an entry with this key lives at."""
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key):
+        """
+        Look up an entry and mark it as recently used.
+
+        Returns:
+            str: Path to the cached file, or None on a miss
+        """
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, write):
+        """
+        Store an entry by calling write(path) on a temporary file.
+
+        The file is moved into place atomically, so concurrent workers never
+        see a half-written entry.
+
+        Args:
+            key (str): Cache key
+            write (callable): Writes the entry to the path it is given
+
+        Returns:
+            str: Path to the cached file
+        """
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self._total_bytes is None:
+            self._total_bytes = self.total_bytes()
+
+        fd, tmp_path = tempfile.mkstemp(suffix=self.suffix, dir=os.path.dirname(path))
+        os.close(fd)
+        try:
+            write(tmp_path)
+            added = os.path.getsize(tmp_path)
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self._total_bytes += added - replaced
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+        return path
+
+    def discard(self, key):
+        """Remove an entry (a corrupt one, say) if it is still there."""
+        try:
+            os.remove(self.path_for(key))
+        except FileNotFoundError:
+            pass
+
+    def entries(self):
+        """List (mtime, size, path) for every entry, oldest first."""
+        found = []
+        if not os.path.isdir(self.directory):
+            return found
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(self.suffix):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append((stat.st_mtime, stat.st_size, path))
+        found.sort()
+        return found
+
+    def total_bytes(self):
+        """Return the combined size of all entries."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total_bytes = total
+
+    def clear(self):
+        """Remove every entry."""
+        for _, _, path in self.entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self._total_bytes = 0
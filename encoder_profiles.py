@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+PNG encoder profiles
+Named sets of PNG encoder settings the scripts can pick from, with optional
+palette quantization and a size report for every file written
+"""
+
+from PIL import Image
+import io
+import os
+import zlib
+
+import numpy as np
+
+# zlib strategies accepted by Pillow's PNG encoder as compress_type
+ZLIB_STRATEGIES = {
+    "default": zlib.Z_DEFAULT_STRATEGY,
+    "filtered": zlib.Z_FILTERED,
+    "huffman": zlib.Z_HUFFMAN_ONLY,
+    "rle": zlib.Z_RLE,
+    "fixed": zlib.Z_FIXED,
+}
+
+ENCODER_PROFILES = {
+    # Pillow defaults, as the scripts have always saved
+    "default": {},
+    # Lossless, slower to write, smaller on disk
+    "lossless-max": {"compress_level": 9, "optimize": True},
+    # Alpha-aware 256-colour palette, no dithering (flat decorative art)
+    "palette": {"colors": 256, "dither": False, "compress_level": 9, "strategy": "filtered"},
+    # Same palette with Floyd-Steinberg dithering (soft gradients, photos);
+    # translucent RGBA images are quantized without dithering
+    "palette-dither": {"colors": 256, "dither": True, "compress_level": 9, "strategy": "filtered"},
+    # Small palette for heavily faded strips
+    "palette-small": {"colors": 64, "dither": True, "compress_level": 9, "strategy": "filtered"},
+}
+
+def _quantize(img, colors, dither):
+    """
+    Reduce to a palette image, keeping per-entry alpha for translucent sources.
+
+    Pillow only dithers when mapping an RGB image onto a given palette, so
+    the palette is chosen first and the image then mapped onto it.
+    Translucent RGBA sources use the alpha-aware octree palette undithered.
+    """
+    if img.mode == "RGBA" and img.getextrema()[3][0] < 255:
+        # Only the octree quantizers understand alpha
+        return img.quantize(colors, method=Image.Quantize.FASTOCTREE)
+
+    rgb = img.convert("RGB")
+    palette = rgb.quantize(colors, method=Image.Quantize.MEDIANCUT)
+    if not dither:
+        return palette
+    return rgb.quantize(palette=palette, dither=Image.Dither.FLOYDSTEINBERG)
+
+def _encoded_size(img, **options):
+    """Size in bytes of a PNG encode, without touching the disk."""
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG", **options)
+    return buffer.tell()
+
+def _max_channel_error(original, saved_path):
+    """Largest per-channel difference between an image and its saved file."""
+    mode = "RGBA" if original.mode in ("RGBA", "LA", "P") else "RGB"
+    with Image.open(saved_path) as saved:
+        a = np.asarray(original.convert(mode), dtype=np.int16)
+        b = np.asarray(saved.convert(mode), dtype=np.int16)
+    return int(np.abs(a - b).max()) if a.size else 0
+
+def save_png(img, output_path, profile="default", verify=False, report=True, baseline=False):
+    """
+    Save an image as PNG using a named encoder profile.
+
+    Args:
+        img (PIL.Image): Image to save
+        output_path (str): Where to write the PNG
+        profile (str): Key of ENCODER_PROFILES
+        verify (bool): Re-read the file and check it against the input;
+            lossless profiles must match exactly, palette profiles report
+            their largest channel error
+        report (bool): Print the before/after byte sizes
+        baseline (bool): Compare against a default-settings encode of img
+            (a second full encode) instead of the file being replaced
+
+    Returns:
+        dict: Profile name, size before (default-encoder size with baseline,
+            else the replaced file's size or None), written size and, when
+            verifying, the largest channel error
+    """
+    if profile not in ENCODER_PROFILES:
+        raise ValueError(f"Unknown encoder profile: {profile}")
+    settings = dict(ENCODER_PROFILES[profile])
+
+    colors = settings.pop("colors", None)
+    dither = settings.pop("dither", False)
+    strategy = settings.pop("strategy", "default")
+    if strategy != "default":
+        settings["compress_type"] = ZLIB_STRATEGIES[strategy]
+
+    if baseline:
+        before_bytes = _encoded_size(img)
+    else:
+        before_bytes = os.path.getsize(output_path) if os.path.exists(output_path) else None
+
+    encoded = _quantize(img, colors, dither) if colors else img
+    encoded.save(output_path, "PNG", **settings)
+
+    result = {
+        "profile": profile,
+        "path": output_path,
+        "before_bytes": before_bytes,
+        "after_bytes": os.path.getsize(output_path),
+    }
+
+    if verify:
+        result["max_error"] = _max_channel_error(img, output_path)
+        if not colors and result["max_error"] != 0:
+            raise ValueError(f"Lossless profile '{profile}' changed pixels in {output_path}")
+
+    if report:
+        if before_bytes is None:
+            line = f"{output_path}: {result['after_bytes']:,} bytes (profile '{profile}')"
+        else:
+            saved = 100 * (1 - result["after_bytes"] / max(before_bytes, 1))
+            line = (f"{output_path}: {before_bytes:,} -> {result['after_bytes']:,} bytes "
+                    f"({saved:.0f}% smaller, profile '{profile}')")
+        if verify:
+            line += f", max channel error {result['max_error']}"
+        print(line)
+
+    return result
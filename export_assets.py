@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Script to export the published site images as responsive WebP/AVIF variants
+Writes several widths (or heights) per asset plus a JSON manifest for srcset /
+image-set. Variants are named <name>-<width>w.<format> or
+<name>-<height>h.<format>; an asset exported only at its own width (None) is
+written as <name>.<format>
+"""
+
+from PIL import Image, features
+import json
+import os
+
+# Published assets and the widths the page can ask for
+PUBLISHED_ASSETS = {
+    "IMG_9089_flipped.png": (320, 640, 960, 1200),
+    # Sized by height, see PUBLISHED_HEIGHTS
+    "combined_images_seamless_all.png": (),
+    # Scrolls at its natural pixel size, so only the full width is exported
+    "menu_combined_scroll_bg.png": (None,),
+}
+
+# Assets the page scales to cover a box by height (background-size: cover on
+# a wide panorama), exported at heights for 1x and 2x hero heights. 1440 px
+# keeps the 18374x2074 panorama under WebP's 16383 px width limit
+PUBLISHED_HEIGHTS = {
+    "combined_images_seamless_all.png": (720, 1440),
+}
+
+FORMAT_OPTIONS = {
+    "webp": {"format": "WEBP", "quality": 80, "method": 6},
+    "avif": {"format": "AVIF", "quality": 60, "speed": 6},
+}
+
+MIME_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def manifest_key(input_path):
+    """
+    Manifest key for a source image: its path relative to the repo, with '/'.
+
+    Args:
+        input_path (str): Path to the published image, absolute or relative
+
+    Returns:
+        str: The key used in the manifest
+    """
+    return os.path.relpath(os.path.abspath(input_path), ROOT).replace(os.sep, "/")
+
+def available_formats(requested=("avif", "webp")):
+    """
+    Filter the requested formats down to the encoders this Pillow has.
+
+    AVIF needs Pillow 11.3+ built with libavif, or the pillow-avif-plugin
+    package; it is skipped with a warning when neither is available.
+
+    Args:
+        requested (tuple): Format names in order of preference
+
+    Returns:
+        list: Usable format names
+    """
+    usable = []
+    for name in requested:
+        if name == "avif" and not features.check("avif"):
+            try:
+                import pillow_avif  # noqa: F401 - registers the AVIF plugin
+            except ImportError:
+                print("Warning: AVIF encoder not available, skipping AVIF variants")
+                continue
+        usable.append(name)
+    return usable
+
+def export_asset(input_path, widths, output_dir="assets", formats=None, heights=None):
+    """
+    Export one image as resized variants in each format.
+
+    Widths (or heights) larger than the source are capped at the source
+    size, so images are never upscaled.
+
+    Args:
+        input_path (str): Path to the published PNG
+        widths (tuple): Target widths (None means the source width)
+        output_dir (str): Directory for the variants
+        formats (list): Format names (default: every available one)
+        heights (tuple): Target heights, used instead of widths
+
+    Returns:
+        dict: Manifest entry describing the variants
+    """
+    formats = formats or available_formats()
+    os.makedirs(output_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(input_path))[0]
+
+    with Image.open(input_path) as img:
+        img.load()
+        source_width, source_height = img.size
+        if img.mode not in ("RGB", "RGBA"):
+            has_alpha = "A" in img.getbands() or "transparency" in img.info
+            img = img.convert("RGBA" if has_alpha else "RGB")
+
+        if heights:
+            targets = sorted({
+                (max(1, round(source_width * height / source_height)), height)
+                for height in (min(height, source_height) for height in heights)
+            })
+        else:
+            targets = sorted({
+                (width, max(1, round(source_height * width / source_width)))
+                for width in (min(width or source_width, source_width) for width in widths)
+            })
+
+        entry = {
+            "source": manifest_key(input_path),
+            "width": source_width,
+            "height": source_height,
+            "source_bytes": os.path.getsize(input_path),
+            "variants": [],
+        }
+
+        for width, height in targets:
+            resized = img if (width, height) == img.size else img.resize(
+                (width, height), Image.Resampling.LANCZOS, reducing_gap=3.0
+            )
+
+            # The natural-size-only assets keep a stable name the CSS can use
+            if heights:
+                suffix = f"-{height}h"
+            else:
+                suffix = "" if widths == (None,) else f"-{width}w"
+            for fmt in formats:
+                output_path = os.path.join(output_dir, f"{name}{suffix}.{fmt}")
+                options = dict(FORMAT_OPTIONS[fmt])
+                resized.save(output_path, options.pop("format"), **options)
+                entry["variants"].append({
+                    "format": fmt,
+                    "type": MIME_TYPES[fmt],
+                    "width": width,
+                    "height": height,
+                    "path": output_path.replace(os.sep, "/"),
+                    "bytes": os.path.getsize(output_path),
+                })
+
+    entry["srcset"] = {
+        fmt: ", ".join(
+            f"{variant['path']} {variant['width']}w"
+            for variant in entry["variants"] if variant["format"] == fmt
+        )
+        for fmt in formats
+    }
+    return entry
+
+def export_published_assets(assets=None, output_dir="assets", manifest_path=None, formats=None):
+    """
+    Export every published asset and write the variant manifest.
+
+    Args:
+        assets (dict): Source path -> widths (default: PUBLISHED_ASSETS)
+        output_dir (str): Directory for the variants
+        manifest_path (str): Where to write the JSON manifest
+            (default: <output_dir>/manifest.json)
+        formats (list): Format names (default: every available one)
+
+    Returns:
+        dict: The manifest
+    """
+    assets = assets or PUBLISHED_ASSETS
+    formats = formats or available_formats()
+    manifest_path = manifest_path or os.path.join(output_dir, "manifest.json")
+    manifest = {}
+
+    for input_path, widths in assets.items():
+        if not os.path.exists(input_path):
+            print(f"Warning: {input_path} not found, skipping")
+            continue
+
+        try:
+            heights = PUBLISHED_HEIGHTS.get(os.path.basename(input_path))
+            entry = export_asset(input_path, widths, output_dir, formats, heights)
+        except Exception as e:
+            print(f"Error exporting {input_path}: {e}")
+            continue
+
+        manifest[manifest_key(input_path)] = entry
+        smallest = min(variant["bytes"] for variant in entry["variants"])
+        print(f"Exported {input_path}: {len(entry['variants'])} variants, "
+              f"{entry['source_bytes']:,} bytes -> smallest {smallest:,} bytes")
+
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    with open(manifest_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    print(f"Manifest written to: {manifest_path}")
+
+    return manifest
+
+def export_and_record(input_path, output_dir="assets", manifest_path=None):
+    """
+    Export one published asset and merge its entry into the existing manifest.
+
+    Used by the scripts that produce published images, so a rerun of one
+    script refreshes only that asset's variants.
+
+    Args:
+        input_path (str): Path to a key of PUBLISHED_ASSETS
+        output_dir (str): Directory for the variants
+        manifest_path (str): Manifest to update (default: <output_dir>/manifest.json)
+
+    Returns:
+        dict: The asset's manifest entry, or None on failure
+    """
+    manifest_path = manifest_path or os.path.join(output_dir, "manifest.json")
+    widths = PUBLISHED_ASSETS.get(os.path.basename(input_path), (None,))
+    heights = PUBLISHED_HEIGHTS.get(os.path.basename(input_path))
+
+    try:
+        entry = export_asset(input_path, widths, output_dir, heights=heights)
+    except Exception as e:
+        print(f"Error exporting {input_path}: {e}")
+        return None
+
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+    manifest[manifest_key(input_path)] = entry
+
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    with open(manifest_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    print(f"Exported {len(entry['variants'])} web variants of {input_path}")
+    return entry
+
+if __name__ == "__main__":
+    print("Exporting responsive image variants...")
+    export_published_assets()
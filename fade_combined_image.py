@@ -1,5 +1,6 @@
-from PIL import Image, ImageEnhance
 import os
+from fade_kernel import fade_opacity
+from image_resize import open_image
 
 def fade_image(input_path, output_path, opacity=0.7):
     """
@@ -13,17 +14,11 @@ def fade_image(input_path, output_path, opacity=0.7):
     try:
         # Open the combined image
         print(f"Loading image: {input_path}")
-        image = Image.open(input_path)
+        image = open_image(input_path)
         
-        # Convert to RGBA if not already (to support transparency)
-        if image.mode != 'RGBA':
-            image = image.convert('RGBA')
-        
-        # Create a transparent overlay
-        overlay = Image.new('RGBA', image.size, (255, 255, 255, 0))
-        
-        # Apply opacity to the original image
-        faded_image = Image.blend(overlay, image, opacity)
+        # Apply opacity against a transparent white matte as a single
+        # point operation (no full-size overlay image)
+        faded_image = fade_opacity(image, opacity, (255, 255, 255, 0))
         
         # Save the faded image
         faded_image.save(output_path, 'PNG')
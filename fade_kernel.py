@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Fade/tint point-operation kernel
+Opacity, brightness and matte colour are folded into 256-entry lookup tables,
+so fading an image needs no full-size overlay image and a single pass
+"""
+
+from PIL import Image, ImageEnhance
+import numpy as np
+
+WHITE = (255, 255, 255)
+
+def _ramp_image():
+    """RGBA image holding every (alpha, value) pair: value on x, alpha on y."""
+    values = np.arange(256, dtype=np.uint8)
+    ramp = np.empty((256, 256, 4), dtype=np.uint8)
+    ramp[:, :, :3] = values[np.newaxis, :, np.newaxis]
+    ramp[:, :, 3] = values[:, np.newaxis]
+    return Image.fromarray(ramp, 'RGBA')
+
+def matte_fade_tables(opacity, brightness=1.0, matte=WHITE):
+    """
+    Tables for brightening an image and laying a translucent matte over it.
+
+    The reference operation (ImageEnhance.Brightness followed by
+    alpha_composite with a matte overlay of alpha 255 * (1 - opacity)) is run
+    once over a 256x256 ramp, so the tables reproduce it exactly.
+
+    Args:
+        opacity (float): How much of the image shows through (0.0 to 1.0)
+        brightness (float): Brightness adjustment (1.0 = original)
+        matte (tuple): RGB colour of the overlay
+
+    Returns:
+        tuple: (rgb_tables indexed [channel, alpha, value], alpha_table indexed [alpha])
+    """
+    ramp = _ramp_image()
+    brightened = ImageEnhance.Brightness(ramp).enhance(brightness)
+    overlay = Image.new('RGBA', ramp.size, tuple(matte[:3]) + (int(255 * (1 - opacity)),))
+    faded = np.asarray(Image.alpha_composite(brightened, overlay))
+
+    rgb_tables = np.ascontiguousarray(faded[:, :, :3].transpose(2, 0, 1))
+    return rgb_tables, faded[:, 0, 3].copy()
+
+def blend_lut(opacity, matte=WHITE + (0,)):
+    """
+    Point table for Image.blend between a constant colour and an image.
+
+    Args:
+        opacity (float): Weight of the image (0.0 = matte only, 1.0 = image only)
+        matte (tuple): RGBA colour blended against
+
+    Returns:
+        list: 1024-entry table for Image.point on an RGBA image
+    """
+    values = np.arange(256, dtype=np.uint8)
+    ramp = Image.fromarray(np.repeat(values[np.newaxis, :, np.newaxis], 4, axis=2), 'RGBA')
+    background = Image.new('RGBA', ramp.size, tuple(matte))
+    blended = np.asarray(Image.blend(background, ramp, opacity))[0]
+    return [int(value) for channel in range(4) for value in blended[:, channel]]
+
+def fade_to_matte(img, opacity, brightness=1.0, matte=WHITE, opaque=None):
+    """
+    Brighten an image and fade it towards a matte colour in one pass.
+
+    Fully opaque images go through Image.point; images with transparency
+    use one NumPy table lookup, because their result depends on alpha.
+
+    Args:
+        img (PIL.Image): Source image (converted to RGBA if needed)
+        opacity (float): How much of the image shows through (0.0 to 1.0)
+        brightness (float): Brightness adjustment (1.0 = original)
+        matte (tuple): RGB colour faded towards
+        opaque (bool): Whether img is fully opaque, if already known; callers
+            fading one image several times pass it to skip the alpha scan
+
+    Returns:
+        PIL.Image: Faded RGBA image
+    """
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    if opaque is None:
+        opaque = img.getextrema()[3] == (255, 255)
+
+    rgb_tables, alpha_table = matte_fade_tables(opacity, brightness, matte)
+
+    if opaque:
+        lut = [int(value) for table in rgb_tables[:, 255] for value in table]
+        return img.point(lut + [int(value) for value in alpha_table])
+
+    data = np.asarray(img)
+    alpha = data[:, :, 3]
+    out = np.empty_like(data)
+    for channel in range(3):
+        out[:, :, channel] = rgb_tables[channel][alpha, data[:, :, channel]]
+    out[:, :, 3] = alpha_table[alpha]
+    return Image.fromarray(out, 'RGBA')
+
+def fade_opacity(img, opacity, matte=WHITE + (0,)):
+    """
+    Blend an image towards a constant RGBA colour by a fixed weight.
+
+    Equivalent to Image.blend(Image.new('RGBA', size, matte), img, opacity)
+    without allocating the constant image.
+
+    Args:
+        img (PIL.Image): Source image (converted to RGBA if needed)
+        opacity (float): Weight of the image (0.0 = matte only, 1.0 = image only)
+        matte (tuple): RGBA colour blended against
+
+    Returns:
+        PIL.Image: Faded RGBA image
+    """
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    return img.point(blend_lut(opacity, matte))
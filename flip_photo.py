@@ -6,17 +6,24 @@ Script to flip IMG_9089.HEIC horizontally so the person looks to the right
 from PIL import Image
 import pillow_heif
 import os
+from heic_decode import decode_heic
+from export_assets import export_and_record
+
+# Web display size for the profile photo used in index.html
+WEB_MAX_SIZE = (1200, 1600)
 
 # Register HEIF opener with pillow
 pillow_heif.register_heif_opener()
 
-def flip_photo_horizontally(input_path, output_path=None):
+def flip_photo_horizontally(input_path, output_path=None, max_size=None):
     """
     Flip a photo horizontally (left to right).
     
     Args:
         input_path (str): Path to the input image
         output_path (str): Path to save the flipped image (optional)
+        max_size (tuple): Largest (width, height) needed; smaller targets are
+            decoded from the embedded thumbnail or reduced, not kept at full size
     
     Returns:
         str: Path to the output image
@@ -36,8 +43,8 @@ def flip_photo_horizontally(input_path, output_path=None):
                 output_path = f"{name}_flipped{ext}"
         
         print(f"Opening {input_path}...")
-        # Open the image
-        with Image.open(input_path) as img:
+        # Open the image at the resolution we actually need
+        with decode_heic(input_path, max_size) as img:
             # Flip horizontally using transpose
             flipped_img = img.transpose(Image.FLIP_LEFT_RIGHT)
             
@@ -53,12 +60,38 @@ def flip_photo_horizontally(input_path, output_path=None):
         print("Make sure you have Pillow and pillow-heif installed: pip install Pillow pillow-heif")
         return None
 
+def flip_photos_batch(source, max_workers=None):
+    """
+    Flip every HEIC matched by a directory or glob on a process pool.
+    
+    Args:
+        source (str): Directory, glob pattern or single file
+        max_workers (int): Pool size (default: one worker per core)
+    
+    Returns:
+        dict: Output path (or None on failure) per input file
+    """
+    from batch_process import find_heic_files, run_in_pool
+    
+    input_paths = find_heic_files(source)
+    results = dict(run_in_pool(flip_photo_horizontally, input_paths, max_workers))
+    return {path: results[path] for path in input_paths}
+
 if __name__ == "__main__":
+    import sys
+    
+    # Batch mode: python flip_photo.py <directory-or-glob>
+    if len(sys.argv) > 1:
+        for path, output in flip_photos_batch(sys.argv[1]).items():
+            print(f"{'✅' if output else '❌'} {path} -> {output}")
+        sys.exit(0)
+    
     # Flip the IMG_9089.HEIC image
     input_file = "IMG_9089.HEIC"
-    result = flip_photo_horizontally(input_file)
+    result = flip_photo_horizontally(input_file, max_size=WEB_MAX_SIZE)
     
     if result:
         print(f"\n✅ Success! Flipped image saved as: {result}")
+        export_and_record(result)
     else:
         print("\n❌ Failed to flip image")
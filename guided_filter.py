@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Edge-aware mask upsampling
+Fast guided filter: the linear coefficients are fitted at the low resolution
+the mask was inferred at, then upsampled and applied to the full-resolution
+guide, so edges follow the real image instead of the blurry small mask
+"""
+
+from PIL import Image
+import numpy as np
+
+def box_filter(data, radius):
+    """
+    Mean over a (2r+1) x (2r+1) window, using cumulative sums.
+
+    Windows are clipped at the borders and normalised by their real size.
+
+    Args:
+        data (np.ndarray): 2-D float array
+        radius (int): Window radius in pixels
+
+    Returns:
+        np.ndarray: Filtered float32 array of the same shape
+    """
+    height, width = data.shape
+    padded = np.zeros((height + 1, width + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(data, axis=0, dtype=np.float64), axis=1, out=padded[1:, 1:])
+
+    top = np.clip(np.arange(height) - radius, 0, height)
+    bottom = np.clip(np.arange(height) + radius + 1, 0, height)
+    left = np.clip(np.arange(width) - radius, 0, width)
+    right = np.clip(np.arange(width) + radius + 1, 0, width)
+
+    total = (padded[bottom][:, right] - padded[top][:, right]
+             - padded[bottom][:, left] + padded[top][:, left])
+    area = np.outer(bottom - top, right - left)
+    return (total / area).astype(np.float32)
+
+def guided_coefficients(guide, src, radius, eps):
+    """
+    Fit the guided-filter linear model src ~ a * guide + b per window.
+
+    Args:
+        guide (np.ndarray): 2-D float guide in [0, 1]
+        src (np.ndarray): 2-D float input in [0, 1]
+        radius (int): Window radius
+        eps (float): Regularisation; larger values smooth more
+
+    Returns:
+        tuple: (a, b) float32 arrays, already box-averaged
+    """
+    mean_i = box_filter(guide, radius)
+    mean_p = box_filter(src, radius)
+    cov_ip = box_filter(guide * src, radius) - mean_i * mean_p
+    var_i = box_filter(guide * guide, radius) - mean_i * mean_i
+
+    a = cov_ip / (var_i + eps)
+    b = mean_p - a * mean_i
+    return box_filter(a, radius), box_filter(b, radius)
+
+def _to_float(img):
+    """'L' image as a float32 array in [0, 1]."""
+    return np.asarray(img, dtype=np.float32) / 255.0
+
+def _resize_float(data, size):
+    """Bilinear resize of a float32 array to (width, height)."""
+    return np.array(Image.fromarray(data, "F").resize(size, Image.Resampling.BILINEAR))
+
+def upsample_mask(mask, guide, radius=8, eps=1e-3):
+    """
+    Upsample a low-resolution alpha mask to the guide image's size.
+
+    Args:
+        mask (PIL.Image): Low-resolution 'L' mask
+        guide (PIL.Image): Full-resolution image the mask belongs to
+        radius (int): Filter radius at the mask's resolution
+        eps (float): Edge sensitivity; smaller values follow edges more tightly
+
+    Returns:
+        PIL.Image: 'L' mask at the guide's size
+    """
+    full_guide = guide.convert("L")
+    small_guide = full_guide.resize(mask.size, Image.Resampling.BOX)
+
+    a, b = guided_coefficients(_to_float(small_guide), _to_float(mask.convert("L")), radius, eps)
+
+    alpha = _resize_float(a, guide.size)
+    alpha *= _to_float(full_guide)
+    alpha += _resize_float(b, guide.size)
+
+    np.clip(alpha, 0.0, 1.0, out=alpha)
+    return Image.fromarray(np.rint(alpha * 255.0).astype(np.uint8), "L")
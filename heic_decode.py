@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Size-aware HEIC decoding
+Uses the embedded thumbnail when it is large enough for the requested output,
+and only falls back to a full-resolution decode when it is not
+"""
+
+from PIL import Image
+import pillow_heif
+
+# Register HEIF opener with pillow
+pillow_heif.register_heif_opener()
+
+def fit_within(size, max_size):
+    """
+    Scale a size down (never up) to fit inside a bounding box.
+
+    Args:
+        size (tuple): (width, height) of the source
+        max_size (tuple): (max_width, max_height) bounding box
+
+    Returns:
+        tuple: (width, height) preserving the aspect ratio
+    """
+    width, height = size
+    scale = min(max_size[0] / width, max_size[1] / height, 1.0)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+def decode_heic(input_path, max_size=None, allow_thumbnail=True):
+    """
+    Decode a HEIC at no more than the resolution the caller needs.
+
+    With max_size set, the smallest embedded thumbnail that still covers the
+    target size is decoded instead of the primary image. libheif cannot decode
+    HEVC at a reduced scale, so when no thumbnail is big enough the full image
+    is decoded and then reduced with Pillow's reducing resample.
+
+    Args:
+        input_path (str): Path to the HEIC (or any Pillow-readable) image
+        max_size (tuple): (max_width, max_height) of the output, None for full size
+        allow_thumbnail (bool): Set to False to always decode the primary image
+
+    Returns:
+        PIL.Image: Loaded image no larger than max_size
+    """
+    img = Image.open(input_path)
+
+    if max_size is None:
+        img.load()
+        return img
+
+    target = fit_within(img.size, max_size)
+    if target == img.size:
+        img.load()
+        return img
+
+    if allow_thumbnail:
+        # pillow-heif picks the smallest embedded thumbnail >= target, if any
+        img.draft(img.mode, target)
+
+    img.load()
+    if img.size != target:
+        img = img.resize(target, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    return img
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Resize helpers shared by the join, blend and menu scripts
+JPEGs are decoded at a reduced DCT scale close to the target before the final
+LANCZOS resample, unless an exact full-resolution decode is requested.
+Resized tiles of image files are kept on disk by resize_cache; long-running
+processes (watch mode) can also keep decoded sources and resized tiles in
+memory with enable_memory_cache()
+"""
+
+from collections import OrderedDict
+import os
+
+from PIL import Image
+
+from resize_cache import CACHEABLE_MODES, default_resize_cache
+
+# Decode at least this many times the target size so LANCZOS still has
+# detail to work with (same idea as Image.thumbnail's reducing_gap)
+DRAFT_GAP = 2.0
+
+# Integer pre-reduction before LANCZOS, used only on top of a JPEG draft
+# decode (which is already approximate); other sources get a plain LANCZOS
+REDUCING_GAP = 3.0
+
+RESAMPLE = Image.Resampling.LANCZOS
+
+# What _resize does, for the on-disk cache keys
+RESIZE_PARAMS = (RESAMPLE.name, f"draft_gap={DRAFT_GAP}", f"reducing_gap={REDUCING_GAP}")
+
+# In-process LRU of decoded sources and resized tiles; None until enabled
+_memory_cache = None
+
+class MemoryCache:
+    """
+    Images kept in memory, least recently used evicted past max_bytes.
+
+    Args:
+        max_bytes (int): Total pixel bytes to keep
+    """
+
+    def __init__(self, max_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Return a copy of the cached image, or None on a miss."""
+        img = self.entries.get(key)
+        if img is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return img.copy()
+
+    def put(self, key, img):
+        """Keep a copy of an image under key, evicting old entries to fit."""
+        img = img.copy()
+        size = self._size(img)
+        if size > self.max_bytes:
+            return
+        if key in self.entries:
+            self.total_bytes -= self._size(self.entries.pop(key))
+        self.entries[key] = img
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= self._size(evicted)
+
+    @staticmethod
+    def _size(img):
+        """Pixel bytes held by an image."""
+        return len(img.getbands()) * img.width * img.height
+
+def enable_memory_cache(max_bytes=1024 * 1024 * 1024):
+    """
+    Keep decoded sources and resized tiles in memory for this process.
+
+    Args:
+        max_bytes (int): Memory budget for cached pixels
+
+    Returns:
+        MemoryCache: The active cache
+    """
+    global _memory_cache
+    _memory_cache = MemoryCache(max_bytes)
+    return _memory_cache
+
+def _file_identity(path):
+    """(real path, mtime, size) of a file, so edits produce a new cache key."""
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    return real_path, stat.st_mtime_ns, stat.st_size
+
+def open_image(path):
+    """
+    Open and decode an image file, from the memory cache when it is enabled.
+
+    Args:
+        path (str): Image file path
+
+    Returns:
+        PIL.Image: The decoded image
+    """
+    if _memory_cache is None:
+        return Image.open(path)
+
+    key = ("decoded",) + _file_identity(path)
+    img = _memory_cache.get(key)
+    if img is None:
+        with Image.open(path) as source:
+            source.load()
+            img = source.copy()
+        _memory_cache.put(key, img)
+    return img
+
+def target_width_for_height(size, target_height):
+    """
+    Width that keeps the aspect ratio at a given height.
+
+    Args:
+        size (tuple): (width, height) of the source
+        target_height (int): Height to scale to
+
+    Returns:
+        int: The new width
+    """
+    width, height = size
+    return int(target_height * (width / height))
+
+def resize_image(img, size, exact=False):
+    """
+    Resize an opened image, using JPEG draft decoding when it helps.
+
+    The image should be freshly opened (not yet loaded) for the draft path to
+    apply; already-loaded images are simply resized.
+
+    Args:
+        img (PIL.Image): Opened source image
+        size (tuple): (width, height) to produce
+        exact (bool): Force a full-resolution decode and a plain LANCZOS resize
+
+    Returns:
+        PIL.Image: The resized image
+    """
+    size = tuple(size)
+    filename = getattr(img, "filename", "")
+    if not filename or img.size == size:
+        return _resize(img, size, exact)
+
+    if _memory_cache is not None:
+        # img.size tells a reduced decode (thumbnail, draft) from the full image
+        key = ("tile",) + _file_identity(filename) + (img.mode, img.size, size, exact)
+        resized = _memory_cache.get(key)
+        if resized is None:
+            resized = _cached_resize(img, size, exact)
+            _memory_cache.put(key, resized)
+        return resized
+
+    return _cached_resize(img, size, exact)
+
+def _cached_resize(img, size, exact):
+    """Resize through the on-disk resize cache when it is enabled."""
+    cache = default_resize_cache()
+    if cache is None or img.mode not in CACHEABLE_MODES:
+        return _resize(img, size, exact)
+    return cache.resize(img, size, lambda source, target: _resize(source, target, exact),
+                        RESIZE_PARAMS, exact)
+
+def _resize(img, size, exact):
+    if exact:
+        return img.resize(size, RESAMPLE)
+
+    drafted = False
+    if img.format == "JPEG":
+        full_size = img.size
+        draft_size = (int(size[0] * DRAFT_GAP), int(size[1] * DRAFT_GAP))
+        img.draft(img.mode, draft_size)
+        drafted = img.size != full_size
+
+    if img.size == size:
+        img.load()
+        return img.copy()
+
+    if not drafted:
+        return img.resize(size, RESAMPLE)
+    return img.resize(size, RESAMPLE, reducing_gap=REDUCING_GAP)
+
+def resize_to_height(img, target_height, exact=False):
+    """
+    Resize an opened image to a height, keeping its aspect ratio.
+
+    Args:
+        img (PIL.Image): Opened source image
+        target_height (int): Height to scale to
+        exact (bool): Force a full-resolution decode and a plain LANCZOS resize
+
+    Returns:
+        PIL.Image: The resized image
+    """
+    new_width = target_width_for_height(img.size, target_height)
+    return resize_image(img, (new_width, target_height), exact)
+
+def open_resized_to_height(path, target_height, exact=False):
+    """
+    Open an image file and resize it to a height, keeping its aspect ratio.
+
+    Args:
+        path (str): Image file path
+        target_height (int): Height to scale to
+        exact (bool): Force a full-resolution decode and a plain LANCZOS resize
+
+    Returns:
+        PIL.Image: The resized image
+    """
+    with Image.open(path) as img:
+        return resize_to_height(img, target_height, exact)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Per-stage pipeline instrumentation
+Records wall time, CPU time, resident memory and pixel/byte counts for
+each stage of a run, prints a summary table and appends a JSONL report.
+cProfile and tracemalloc are switched on by environment variables:
+
+    PIPELINE_REPORT=stages.jsonl      append one JSON line per run
+    PIPELINE_PROFILE=profiles/        write <run>_<stage>.prof (cProfile)
+    PIPELINE_TRACEMALLOC=snapshots/   trace Python allocations, write
+                                      <run>_<stage>.tracemalloc snapshots
+
+tracemalloc only sees Python allocations, not Pillow's pixel buffers, so
+the RSS figures (VmRSS / VmHWM from /proc) are reported next to it.
+"""
+
+from PIL import Image
+import contextlib
+import cProfile
+import json
+import os
+import re
+import time
+import tracemalloc
+
+import numpy as np
+
+REPORT_ENV = "PIPELINE_REPORT"
+PROFILE_ENV = "PIPELINE_PROFILE"
+TRACEMALLOC_ENV = "PIPELINE_TRACEMALLOC"
+# Traceback depth kept when tracemalloc snapshots are requested
+SNAPSHOT_FRAMES = 25
+
+def describe(value):
+    """
+    Pixel and byte counts of a stage input or output.
+
+    Args:
+        value: PIL image, numpy array or file path
+
+    Returns:
+        dict: pixels, bytes and (for images and files) size; empty if unknown
+    """
+    if isinstance(value, Image.Image):
+        return {
+            "size": list(value.size),
+            "pixels": value.width * value.height,
+            "bytes": value.width * value.height * len(value.getbands()),
+        }
+    if isinstance(value, np.ndarray):
+        return {"pixels": int(np.prod(value.shape[:2])), "bytes": int(value.nbytes)}
+    if isinstance(value, (str, os.PathLike)) and os.path.isfile(value):
+        info = {"bytes": os.path.getsize(value)}
+        try:
+            with Image.open(value) as img:
+                info["size"] = list(img.size)
+                info["pixels"] = img.width * img.height
+        except Exception:
+            pass
+        return info
+    return {}
+
+def _rss_bytes():
+    """
+    Current and peak resident set size of this process.
+
+    Returns:
+        tuple: (VmRSS, VmHWM) in bytes, or (None, None) without /proc
+    """
+    values = {}
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    values[line.split(":")[0]] = int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return values.get("VmRSS"), values.get("VmHWM")
+
+def _file_stem(text):
+    """Filesystem-safe version of a run or stage name."""
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", os.path.basename(str(text)))
+
+class Stage:
+    """Measurements for one stage; call output() with the stage's result."""
+
+    def __init__(self, name, source=None):
+        self.name = name
+        self.record = {"stage": name, "input": describe(source) if source is not None else {}}
+
+    def output(self, value):
+        """Record the stage result's pixel and byte counts and return it unchanged."""
+        self.record["output"] = describe(value)
+        return value
+
+class PipelineTrace:
+    """
+    Collects stage measurements for one pipeline run.
+
+    Args:
+        run (str): Name of the run, e.g. the input file
+        report_path (str): JSONL file to append to (default: $PIPELINE_REPORT)
+        profile_dir (str): cProfile output directory (default: $PIPELINE_PROFILE)
+        snapshot_dir (str): tracemalloc snapshot directory (default: $PIPELINE_TRACEMALLOC)
+    """
+
+    def __init__(self, run, report_path=None, profile_dir=None, snapshot_dir=None):
+        self.run = str(run)
+        self.report_path = report_path or os.environ.get(REPORT_ENV)
+        self.profile_dir = profile_dir or os.environ.get(PROFILE_ENV)
+        self.snapshot_dir = snapshot_dir or os.environ.get(TRACEMALLOC_ENV)
+        self.stages = []
+
+    def _artifact_path(self, directory, stage, suffix):
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{_file_stem(self.run)}_{_file_stem(stage)}{suffix}")
+
+    @contextlib.contextmanager
+    def stage(self, name, source=None):
+        """
+        Measure the enclosed block as one stage.
+
+        Args:
+            name (str): Stage name for the report
+            source: Stage input (image, array or path) for pixel/byte counts
+
+        Yields:
+            Stage: Call .output(result) to record the stage's output
+        """
+        stage = Stage(name, source)
+
+        # Only trace on request, and never reset the peak of a tracer that
+        # someone else (e.g. benchmark.py) started
+        started_tracing = bool(self.snapshot_dir) and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(SNAPSHOT_FRAMES)
+            baseline = tracemalloc.get_traced_memory()[0]
+        rss_start, _ = _rss_bytes()
+
+        profiler = cProfile.Profile() if self.profile_dir else None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profiler:
+            profiler.enable()
+
+        try:
+            yield stage
+            stage.record["status"] = "ok"
+        except Exception as e:
+            stage.record["status"] = "error"
+            stage.record["error"] = str(e)
+            raise
+        finally:
+            if profiler:
+                profiler.disable()
+            stage.record["wall_s"] = round(time.perf_counter() - wall_start, 4)
+            stage.record["cpu_s"] = round(time.process_time() - cpu_start, 4)
+            if started_tracing:
+                stage.record["peak_traced_bytes"] = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+            rss_end, rss_peak = _rss_bytes()
+            if rss_end is not None:
+                stage.record["rss_delta_bytes"] = rss_end - rss_start
+                stage.record["peak_rss_bytes"] = rss_peak
+
+            if profiler:
+                stage.record["profile"] = self._artifact_path(self.profile_dir, name, ".prof")
+                profiler.dump_stats(stage.record["profile"])
+            if self.snapshot_dir and tracemalloc.is_tracing():
+                stage.record["snapshot"] = self._artifact_path(self.snapshot_dir, name, ".tracemalloc")
+                tracemalloc.take_snapshot().dump(stage.record["snapshot"])
+            if started_tracing:
+                tracemalloc.stop()
+
+            self.stages.append(stage.record)
+
+    def report(self):
+        """The run's measurements as a JSON-serialisable dict."""
+        return {
+            "run": self.run,
+            "pid": os.getpid(),
+            "wall_s": round(sum(stage["wall_s"] for stage in self.stages), 4),
+            "cpu_s": round(sum(stage["cpu_s"] for stage in self.stages), 4),
+            "stages": self.stages,
+        }
+
+    def write_report(self, path=None):
+        """
+        Append the run as one JSON line.
+
+        Args:
+            path (str): JSONL file (default: the trace's report_path)
+
+        Returns:
+            str: Path written, or None when no report path is configured
+        """
+        path = path or self.report_path
+        if not path:
+            return None
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "a") as report_file:
+            report_file.write(json.dumps(self.report()) + "\n")
+        return path
+
+    def summary(self):
+        """
+        One-screen table of the stages.
+
+        "traced MB" is the tracemalloc peak (only with PIPELINE_TRACEMALLOC);
+        "RSS MB" is the process's peak resident size at the end of the stage.
+
+        Returns:
+            str: Formatted table
+        """
+        total_wall = sum(stage["wall_s"] for stage in self.stages) or 1e-9
+        megabytes = (lambda value: f"{value / (1024 * 1024):.1f}" if value is not None else "-")
+        lines = [
+            f"{'stage':<14} {'wall s':>8} {'cpu s':>8} {'share':>6} {'traced MB':>9} {'RSS MB':>8} "
+            f"{'in MP':>7} {'out MP':>7} {'out KB':>9}",
+            "-" * 84,
+        ]
+        for stage in self.stages:
+            inputs, outputs = stage["input"], stage.get("output", {})
+            in_mp = f"{inputs['pixels'] / 1e6:.2f}" if "pixels" in inputs else "-"
+            out_mp = f"{outputs['pixels'] / 1e6:.2f}" if "pixels" in outputs else "-"
+            out_kb = f"{outputs['bytes'] / 1024:,.0f}" if "bytes" in outputs else "-"
+            marker = "" if stage["status"] == "ok" else "  ❌"
+            lines.append(
+                f"{stage['stage']:<14} {stage['wall_s']:>8.3f} {stage['cpu_s']:>8.3f} "
+                f"{100 * stage['wall_s'] / total_wall:>5.0f}% "
+                f"{megabytes(stage.get('peak_traced_bytes')):>9} "
+                f"{megabytes(stage.get('peak_rss_bytes')):>8} "
+                f"{in_mp:>7} {out_mp:>7} {out_kb:>9}{marker}"
+            )
+        lines.append("-" * 84)
+        lines.append(f"{'total':<14} {sum(s['wall_s'] for s in self.stages):>8.3f} "
+                     f"{sum(s['cpu_s'] for s in self.stages):>8.3f}")
+        return "\n".join(lines)
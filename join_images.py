@@ -4,10 +4,50 @@ Script to join multiple images horizontally
 """
 
 from PIL import Image
+import numpy as np
+import glob
 import os
+import tempfile
+from png_writer import write_png_bands
+from image_resize import resize_image
 
-def join_images_horizontally(image_paths, output_path):
-    """Join multiple images horizontally"""
+# Images joined by the script, left to right, as glob patterns: the
+# screenshot names have a narrow no-break space before "AM"
+JOIN_IMAGE_PATTERNS = [
+    "Screenshot 2025-09-14 at 12.34.00?AM.png",
+    "Screenshot 2025-09-14 at 12.33.13?AM.png",
+    "Screenshot 2025-09-14 at 12.32.22?AM.png",
+    "OIG2.XzWwD1jQtvXf_J.3nnd2.jpeg",
+    "OIG3.Lvr9EzPA43yHSRCiATCz.jpeg",
+    "OIG4.krim_Up00g7mdIGo8JRH.jpeg"
+]
+
+def join_image_files(directory="."):
+    """
+    Find the images to join on disk.
+
+    Args:
+        directory (str): Directory holding the images
+
+    Returns:
+        list: File names relative to directory, left to right; a pattern
+            with no match is returned unchanged so it is reported as missing
+    """
+    files = []
+    for pattern in JOIN_IMAGE_PATTERNS:
+        matches = sorted(glob.glob(os.path.join(glob.escape(directory), pattern)))
+        files.append(os.path.relpath(matches[0], directory) if matches else pattern)
+    return files
+
+def join_images_horizontally(image_paths, output_path, exact_decode=False):
+    """
+    Join multiple images horizontally
+    
+    Args:
+        image_paths (list): Paths of the images to join, left to right
+        output_path (str): Path to save the combined PNG
+        exact_decode (bool): Decode JPEGs at full resolution instead of a reduced draft scale
+    """
     
     # Check if all files exist
     for path in image_paths:
@@ -23,40 +63,15 @@ def join_images_horizontally(image_paths, output_path):
             images.append(img)
             print(f"Loaded: {path} - Size: {img.size}")
         
-        # Get the height of the tallest image
-        max_height = max(img.height for img in images)
-        
-        # Resize all images to have the same height while maintaining aspect ratio
-        resized_images = []
-        total_width = 0
-        
-        for img in images:
-            # Calculate new width to maintain aspect ratio
-            aspect_ratio = img.width / img.height
-            new_width = int(max_height * aspect_ratio)
-            
-            # Resize image
-            resized_img = img.resize((new_width, max_height), Image.Resampling.LANCZOS)
-            resized_images.append(resized_img)
-            total_width += new_width
-            print(f"Resized to: {new_width}x{max_height}")
-        
-        # Create new image with combined width
-        combined_image = Image.new('RGB', (total_width, max_height), 'white')
-        
-        # Paste images side by side
-        x_offset = 0
-        for img in resized_images:
-            combined_image.paste(img, (x_offset, 0))
-            x_offset += img.width
+        combined_image = combine_horizontally(images, exact_decode)
         
         # Save the combined image
         combined_image.save(output_path, 'PNG', quality=95)
         print(f"Successfully created combined image: {output_path}")
-        print(f"Final size: {total_width}x{max_height}")
+        print(f"Final size: {combined_image.width}x{combined_image.height}")
         
         # Close all images
-        for img in images + resized_images:
+        for img in images:
             img.close()
         combined_image.close()
         
@@ -66,16 +81,145 @@ def join_images_horizontally(image_paths, output_path):
         print(f"Error processing images: {str(e)}")
         return False
 
+def combine_horizontally(images, exact_decode=False):
+    """
+    Place images side by side, scaled to the height of the tallest one.
+    
+    Args:
+        images (list): PIL images, left to right
+        exact_decode (bool): Decode JPEGs at full resolution instead of a reduced draft scale
+    
+    Returns:
+        PIL.Image: Combined RGB image on a white background
+    """
+    # Get the height of the tallest image
+    max_height = max(img.height for img in images)
+    
+    # Resize all images to have the same height while maintaining aspect ratio
+    resized_images = []
+    total_width = 0
+    
+    for img in images:
+        # Calculate new width to maintain aspect ratio
+        aspect_ratio = img.width / img.height
+        new_width = int(max_height * aspect_ratio)
+        
+        # Resize image
+        resized_img = resize_image(img, (new_width, max_height), exact_decode)
+        resized_images.append(resized_img)
+        total_width += new_width
+        print(f"Resized to: {new_width}x{max_height}")
+    
+    # Create new image with combined width
+    combined_image = Image.new('RGB', (total_width, max_height), 'white')
+    
+    # Paste images side by side
+    x_offset = 0
+    for img in resized_images:
+        combined_image.paste(img, (x_offset, 0))
+        x_offset += img.width
+    
+    return combined_image
+
+def plan_horizontal_layout(image_paths):
+    """
+    Plan a horizontal strip from header-only size probes.
+    
+    Args:
+        image_paths (list): Paths of the images to join, left to right
+    
+    Returns:
+        tuple: (list of (path, new_width, x_offset), total_width, height)
+    """
+    sizes = []
+    for path in image_paths:
+        with Image.open(path) as img:
+            sizes.append(img.size)
+    
+    max_height = max(height for _, height in sizes)
+    
+    layout = []
+    x_offset = 0
+    for path, (width, height) in zip(image_paths, sizes):
+        new_width = int(max_height * (width / height))
+        layout.append((path, new_width, x_offset))
+        x_offset += new_width
+    
+    return layout, x_offset, max_height
+
+def join_images_streaming(image_paths, output_path, band_height=None, exact_decode=False):
+    """
+    Join images horizontally keeping only one source image in memory at a time.
+    
+    Pass 1 plans the layout from file headers. Pass 2 decodes, resizes and
+    pastes each image in turn and releases it before opening the next.
+    With band_height set, the canvas lives in a disk-backed buffer and the PNG
+    is written band by band, so memory stays bounded for arbitrarily long strips.
+    
+    Args:
+        image_paths (list): Paths of the images to join, left to right
+        output_path (str): Path to save the combined PNG
+        band_height (int): Rows per encoded band (None = in-memory canvas)
+        exact_decode (bool): Decode JPEGs at full resolution instead of a reduced draft scale
+    
+    Returns:
+        bool: True on success
+    """
+    
+    # Check if all files exist
+    for path in image_paths:
+        if not os.path.exists(path):
+            print(f"Error: File not found - {path}")
+            return False
+    
+    try:
+        # Pass 1: plan the layout without decoding any pixels
+        layout, total_width, max_height = plan_horizontal_layout(image_paths)
+        print(f"Planned strip: {total_width}x{max_height} from {len(layout)} images")
+        
+        canvas_file = None
+        if band_height:
+            canvas_file = tempfile.TemporaryFile()
+            canvas = np.memmap(canvas_file, dtype=np.uint8, mode='w+',
+                               shape=(max_height, total_width, 3))
+            canvas[:] = 255
+        else:
+            canvas = Image.new('RGB', (total_width, max_height), 'white')
+        
+        # Pass 2: decode, resize and paste one image at a time
+        for path, new_width, x_offset in layout:
+            with Image.open(path) as img:
+                resized_img = resize_image(img, (new_width, max_height), exact_decode)
+            
+            if band_height:
+                canvas[:, x_offset:x_offset + new_width] = np.asarray(resized_img.convert('RGB'))
+            else:
+                canvas.paste(resized_img, (x_offset, 0))
+            
+            print(f"Placed: {path} at x={x_offset} ({new_width}x{max_height})")
+            resized_img.close()
+        
+        if band_height:
+            bands = (canvas[top:top + band_height] for top in range(0, max_height, band_height))
+            write_png_bands(output_path, (total_width, max_height), 'RGB', bands)
+            del canvas
+            canvas_file.close()
+        else:
+            canvas.save(output_path, 'PNG')
+            canvas.close()
+        
+        print(f"Successfully created combined image: {output_path}")
+        print(f"Final size: {total_width}x{max_height}")
+        
+        return True
+        
+    except Exception as e:
+        print(f"Error processing images: {str(e)}")
+        return False
+
 if __name__ == "__main__":
     # List of image files to join
-    image_files = [
-        "./Screenshot 2025-09-14 at 12.34.00 AM.png",
-        "./Screenshot 2025-09-14 at 12.33.13 AM.png", 
-        "./Screenshot 2025-09-14 at 12.32.22 AM.png",
-        "./OIG2.XzWwD1jQtvXf_J.3nnd2.jpeg",
-        "./OIG3.Lvr9EzPA43yHSRCiATCz.jpeg",
-        "./OIG4.krim_Up00g7mdIGo8JRH.jpeg"
-    ]
+    image_files = join_image_files()
     
     output_file = "combined_images_horizontal.png"
     
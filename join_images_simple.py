@@ -6,9 +6,18 @@ Simple script to join images horizontally
 from PIL import Image
 import glob
 import os
+from join_images import join_images_streaming
+from image_resize import resize_image
 
-def join_images_horizontally():
-    """Join multiple images horizontally"""
+def join_images_horizontally(streaming=False, band_height=None, exact_decode=False):
+    """
+    Join multiple images horizontally
+    
+    Args:
+        streaming (bool): Use the bounded-memory two-pass join
+        band_height (int): Rows per PNG band when streaming (None = in-memory canvas)
+        exact_decode (bool): Decode JPEGs at full resolution instead of a reduced draft scale
+    """
     
     # Find all the specific image files
     screenshot_files = sorted(glob.glob("Screenshot*.png"))
@@ -24,6 +33,9 @@ def join_images_horizontally():
         print("No image files found!")
         return False
     
+    if streaming:
+        return join_images_streaming(all_files, "combined_images_horizontal.png", band_height, exact_decode)
+    
     try:
         # Open all images
         images = []
@@ -46,7 +58,7 @@ def join_images_horizontally():
             new_width = int(max_height * aspect_ratio)
             
             # Resize image
-            resized_img = img.resize((new_width, max_height), Image.Resampling.LANCZOS)
+            resized_img = resize_image(img, (new_width, max_height), exact_decode)
             resized_images.append(resized_img)
             total_width += new_width
             print(f"Resized to: {new_width}x{max_height}")
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Content-hash cache for background-removal alpha masks
+Masks are keyed by the decoded input pixels and the model/parameters used
+"""
+
+from PIL import Image
+import os
+
+from disk_cache import DiskCache, image_key
+
+DEFAULT_CACHE_DIR = os.environ.get("REMBG_MASK_CACHE", os.path.join(".cache", "rembg_masks"))
+DEFAULT_MAX_BYTES = int(os.environ.get("REMBG_MASK_CACHE_MB", "512")) * 1024 * 1024
+
+class MaskCache:
+    """
+    On-disk store of 'L' alpha masks with LRU eviction.
+
+    Args:
+        directory (str): Cache directory (default: $REMBG_MASK_CACHE or .cache/rembg_masks)
+        max_bytes (int): Size cap (default: $REMBG_MASK_CACHE_MB megabytes, 512)
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.store = DiskCache(directory, max_bytes, suffix=".png")
+
+    def key(self, img, model_name, **params):
+        """Return the cache key for an image processed with a model and options."""
+        options = ",".join(f"{name}={params[name]}" for name in sorted(params))
+        return image_key(img, model_name, options)
+
+    def load(self, key):
+        """
+        Load a cached mask.
+
+        Returns:
+            PIL.Image: 'L' mask, or None on a miss
+        """
+        path = self.store.get(key)
+        if path is None:
+            return None
+        try:
+            with Image.open(path) as mask:
+                return mask.convert("L")
+        except (OSError, ValueError):
+            # Corrupt (or just evicted by another worker): treat as a miss
+            self.store.discard(key)
+            return None
+
+    def save(self, key, mask):
+        """Store a mask under a key."""
+        self.store.put(key, lambda path: mask.convert("L").save(path, "PNG"))
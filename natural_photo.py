@@ -1,6 +1,48 @@
 from PIL import Image
 import os
 
+def flatten_on_white(img):
+    """
+    Convert an image to RGB, laying any transparency over white.
+    
+    Args:
+        img (PIL.Image): Input image
+    
+    Returns:
+        PIL.Image: RGB image
+    """
+    if img.mode in ('RGBA', 'LA'):
+        # Create white background
+        white_bg = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode == 'RGBA':
+            white_bg.paste(img, mask=img.split()[-1])  # Use alpha channel as mask
+        else:
+            white_bg.paste(img)
+        return white_bg
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+def pad_image(img, padding_percent=15):
+    """
+    Centre an image on a white canvas with proportional padding.
+    
+    Args:
+        img (PIL.Image): RGB image
+        padding_percent (int): Percentage of image size to add on each side
+    
+    Returns:
+        PIL.Image: Padded RGB image
+    """
+    original_width, original_height = img.size
+    padding_w = int(original_width * padding_percent / 100)
+    padding_h = int(original_height * padding_percent / 100)
+    
+    padded_img = Image.new('RGB', (original_width + padding_w * 2, original_height + padding_h * 2),
+                           (255, 255, 255))
+    padded_img.paste(img, (padding_w, padding_h))
+    return padded_img
+
 def add_natural_padding(input_path, output_path=None, padding_percent=15):
     """
     Add white padding around an image to make it look like a natural photo.
@@ -25,39 +67,17 @@ def add_natural_padding(input_path, output_path=None, padding_percent=15):
         
         print(f"Opening {input_path}...")
         
-        # Open the image
-        img = Image.open(input_path)
-        
-        # Convert to RGB if it has transparency
-        if img.mode in ('RGBA', 'LA'):
-            # Create white background
-            white_bg = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'RGBA':
-                white_bg.paste(img, mask=img.split()[-1])  # Use alpha channel as mask
-            else:
-                white_bg.paste(img)
-            img = white_bg
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
+        # Open the image, with any transparency laid over white
+        img = flatten_on_white(Image.open(input_path))
         
         print("Adding natural padding...")
         
-        # Calculate padding
+        # Centre it on a white canvas with padding on every side
         original_width, original_height = img.size
-        padding_w = int(original_width * padding_percent / 100)
-        padding_h = int(original_height * padding_percent / 100)
-        
-        # Create new image with white background and padding
-        new_width = original_width + (padding_w * 2)
-        new_height = original_height + (padding_h * 2)
-        
-        # Create white canvas
-        padded_img = Image.new('RGB', (new_width, new_height), (255, 255, 255))
-        
-        # Paste the original image in the center
-        paste_x = padding_w
-        paste_y = padding_h
-        padded_img.paste(img, (paste_x, paste_y))
+        padded_img = pad_image(img, padding_percent)
+        new_width, new_height = padded_img.size
+        padding_w = (new_width - original_width) // 2
+        padding_h = (new_height - original_height) // 2
         
         # Save the result
         print(f"Saving natural-looking image to {output_path}...")
@@ -97,19 +117,8 @@ def create_photo_style(input_path, output_path=None):
         
         print(f"Opening {input_path}...")
         
-        # Open the image
-        img = Image.open(input_path)
-        
-        # Convert to RGB if needed
-        if img.mode in ('RGBA', 'LA'):
-            white_bg = Image.new('RGB', img.size, (255, 255, 255))
-            if img.mode == 'RGBA':
-                white_bg.paste(img, mask=img.split()[-1])
-            else:
-                white_bg.paste(img)
-            img = white_bg
-        elif img.mode != 'RGB':
-            img = img.convert('RGB')
+        # Open the image, with any transparency laid over white
+        img = flatten_on_white(Image.open(input_path))
         
         print("Creating photo-style layout...")
         
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Run a chain of image operations from one command
+Inputs are decoded once, every stage works on the in-memory images, and the
+result is encoded once at the end. For example:
+
+    python pipeline_cli.py "flip | remove-bg | flatten | pad 15% | crop 8% | export webp" IMG_9089.HEIC
+    python pipeline_cli.py "join | fade 0.7 | export png palette" a.png b.png c.png -o strip.png
+"""
+
+import argparse
+import os
+import shlex
+import sys
+
+from heic_decode import decode_heic
+from instrumentation import PipelineTrace
+
+def _percent(token):
+    """Parse '15%' or '15' as a number."""
+    return float(token.rstrip('%'))
+
+def _flip(img):
+    from process_img0829 import flip_image_horizontal
+    return flip_image_horizontal(img)
+
+def _remove_bg(img, *options):
+    from background_removal import DEFAULT_MODEL
+    from process_img0829 import remove_background_ai
+
+    model_name, inference_size = DEFAULT_MODEL, None
+    for option in options:
+        if option.isdigit():
+            inference_size = int(option)
+        else:
+            model_name = option
+    return remove_background_ai(img, model_name=model_name, inference_size=inference_size)
+
+def _flatten(img):
+    from process_img0829 import add_white_background
+    return add_white_background(img)
+
+def _pad(img, percent="15%"):
+    from natural_photo import flatten_on_white, pad_image
+    return pad_image(flatten_on_white(img), _percent(percent))
+
+def _crop(img, percent="8%"):
+    from process_img0829 import flatten_and_crop, smart_crop_photo
+    if img.mode == 'RGBA':
+        return flatten_and_crop(img, margin_percent=_percent(percent))
+    return smart_crop_photo(img, margin_percent=_percent(percent))
+
+def _fade(img, opacity="0.7", brightness="1.0"):
+    from fade_kernel import fade_to_matte
+    return fade_to_matte(img, float(opacity), float(brightness))
+
+def _resize(img, size):
+    from image_resize import resize_image
+    if 'x' in size:
+        width, height = (int(value) for value in size.split('x'))
+    else:
+        width = int(size)
+        height = max(1, round(img.height * width / img.width))
+    return resize_image(img, (width, height))
+
+def _join(images):
+    from join_images import combine_horizontally
+    return combine_horizontally(images)
+
+def _blend(images, blend_width="100"):
+    from create_seamless_blend import blend_images
+    return blend_images(images, int(blend_width))
+
+# name -> (function, combines the image list into one, usage)
+STAGES = {
+    "flip": (_flip, False, "flip"),
+    "remove-bg": (_remove_bg, False, "remove-bg [model] [inference size]"),
+    "flatten": (_flatten, False, "flatten"),
+    "pad": (_pad, False, "pad <percent>"),
+    "crop": (_crop, False, "crop <margin percent>"),
+    "fade": (_fade, False, "fade <opacity> [brightness]"),
+    "resize": (_resize, False, "resize <width> | resize <width>x<height>"),
+    "join": (_join, True, "join"),
+    "blend": (_blend, True, "blend [blend width]"),
+}
+
+EXPORT_FORMATS = ("png", "webp", "avif", "jpeg")
+
+def parse_chain(chain):
+    """
+    Split a chain like "flip | pad 15% | export webp" into stages.
+
+    Args:
+        chain (str): Stages separated by '|'
+
+    Returns:
+        tuple: ([(name, args), ...], export args or None)
+    """
+    stages, export = [], None
+    for part in chain.split('|'):
+        tokens = shlex.split(part)
+        if not tokens:
+            continue
+        name, args = tokens[0].lower(), tokens[1:]
+        if export is not None:
+            raise ValueError("'export' must be the last stage")
+        if name == "export":
+            if not args or args[0].lower() not in EXPORT_FORMATS:
+                raise ValueError(f"export needs a format: {', '.join(EXPORT_FORMATS)}")
+            export = [args[0].lower()] + args[1:]
+        elif name in STAGES:
+            stages.append((name, args))
+        else:
+            raise ValueError(f"Unknown stage: {name}")
+    return stages, export
+
+def encode(img, output_path, fmt, *options):
+    """
+    Write the final image once, in the requested format.
+
+    Args:
+        img (PIL.Image): Image to write
+        output_path (str): Destination file
+        fmt (str): png, webp, avif or jpeg
+        options: PNG encoder profile name, or quality for the lossy formats
+
+    Returns:
+        str: The output path
+    """
+    if fmt == "png":
+        from encoder_profiles import save_png
+        save_png(img, output_path, options[0] if options else "default")
+        return output_path
+
+    from export_assets import FORMAT_OPTIONS, available_formats
+
+    if fmt == "jpeg":
+        settings = {"format": "JPEG", "quality": 90, "optimize": True}
+        img = img.convert('RGB')
+    else:
+        if fmt not in available_formats((fmt,)):
+            raise ValueError(f"No {fmt} encoder available")
+        settings = dict(FORMAT_OPTIONS[fmt])
+    if options:
+        settings["quality"] = int(options[0])
+
+    img.save(output_path, settings.pop("format"), **settings)
+    return output_path
+
+def run_chain(chain, input_paths, output_path=None, max_size=None):
+    """
+    Decode the inputs, run the stage chain and encode the result.
+
+    Args:
+        chain (str): Stage chain, e.g. "flip | remove-bg | export webp"
+        input_paths (list): Input files; several inputs need a join or blend
+            stage unless each is written on its own
+        output_path (str): Output file (default: derived from the first input)
+        max_size (tuple): Largest (width, height) to decode HEICs at
+
+    Returns:
+        list: Paths written
+    """
+    stages, export = parse_chain(chain)
+    if export is None:
+        extension = os.path.splitext(output_path or "")[1].lower().lstrip('.')
+        export = ["jpeg" if extension == "jpg" else extension if extension in EXPORT_FORMATS else "png"]
+
+    trace = PipelineTrace(" + ".join(os.path.basename(path) for path in input_paths))
+    images = []
+    for path in input_paths:
+        with trace.stage("decode", path) as stage:
+            images.append(stage.output(decode_heic(path, max_size)))
+
+    try:
+        for name, args in stages:
+            function, combines, usage = STAGES[name]
+            with trace.stage(name, images[0]) as stage:
+                if combines:
+                    images = [function(images, *args)]
+                else:
+                    images = [function(img, *args) for img in images]
+                if any(img is None for img in images):
+                    raise RuntimeError(f"Stage '{name}' failed (usage: {usage})")
+                stage.output(images[0])
+
+        if output_path and len(images) > 1:
+            raise ValueError("Several images remain; add a join or blend stage, or drop -o")
+
+        extension = "jpg" if export[0] == "jpeg" else export[0]
+        written = []
+        for path, img in zip(input_paths, images):
+            target = output_path or f"{os.path.splitext(path)[0]}_pipeline.{extension}"
+            with trace.stage("encode", img) as stage:
+                written.append(stage.output(encode(img, target, *export)))
+        return written
+
+    finally:
+        print("\n" + trace.summary())
+        trace.write_report()
+
+def main():
+    stage_help = "\n".join(f"  {usage}" for _, _, usage in STAGES.values())
+    parser = argparse.ArgumentParser(
+        description=__doc__.strip().splitlines()[0],
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"stages:\n{stage_help}\n  export <{'|'.join(EXPORT_FORMATS)}> [profile or quality]",
+    )
+    parser.add_argument("chain", help="Stages separated by '|', quoted as one argument")
+    parser.add_argument("inputs", nargs="+", help="Input images")
+    parser.add_argument("-o", "--output", help="Output file")
+    parser.add_argument("--max-size", help="Decode HEICs at no more than WIDTHxHEIGHT")
+    args = parser.parse_args()
+
+    max_size = tuple(int(value) for value in args.max_size.split('x')) if args.max_size else None
+
+    try:
+        written = run_chain(args.chain, args.inputs, args.output, max_size)
+    except Exception as e:
+        print(f"\n❌ Pipeline failed: {e}")
+        return 1
+
+    for path in written:
+        print(f"✅ Saved: {path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
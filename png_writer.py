@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Streaming PNG writer
+Encodes an image band by band so the whole picture never has to be in memory
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+COLOR_TYPES = {"L": 0, "RGB": 2, "RGBA": 6}
+
+def _chunk(kind, data):
+    """Serialize one PNG chunk."""
+    crc = zlib.crc32(kind + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", crc)
+
+def _sub_filter(band):
+    """Apply the PNG 'Sub' filter to every row of a band and prefix filter bytes."""
+    height, width, channels = band.shape
+    rows = band.reshape(height, width * channels)
+    filtered = rows.copy()
+    filtered[:, channels:] -= rows[:, :-channels]
+    out = np.empty((height, width * channels + 1), dtype=np.uint8)
+    out[:, 0] = 1
+    out[:, 1:] = filtered
+    return out.tobytes()
+
+def write_png_bands(output_path, size, mode, bands, compress_level=6):
+    """
+    Write a PNG from an iterable of row bands.
+
+    Args:
+        output_path (str): Where to write the PNG
+        size (tuple): (width, height) of the full image
+        mode (str): 'L', 'RGB' or 'RGBA'
+        bands (iterable): uint8 arrays of shape (rows, width, channels), top to bottom
+        compress_level (int): zlib level 0-9
+
+    Returns:
+        str: The output path
+    """
+    width, height = size
+    if mode not in COLOR_TYPES:
+        raise ValueError(f"Unsupported PNG mode: {mode}")
+    channels = len(mode)
+
+    compressor = zlib.compressobj(compress_level)
+    rows_written = 0
+
+    with open(output_path, "wb") as out:
+        out.write(PNG_SIGNATURE)
+        header = struct.pack(">IIBBBBB", width, height, 8, COLOR_TYPES[mode], 0, 0, 0)
+        out.write(_chunk(b"IHDR", header))
+
+        for band in bands:
+            band = np.asarray(band, dtype=np.uint8)
+            if band.ndim == 2:
+                band = band[:, :, np.newaxis]
+            if band.shape[1:] != (width, channels):
+                raise ValueError(f"Band shape {band.shape} does not match {width}x{mode}")
+
+            data = compressor.compress(_sub_filter(band))
+            if data:
+                out.write(_chunk(b"IDAT", data))
+            rows_written += band.shape[0]
+
+        if rows_written != height:
+            raise ValueError(f"Expected {height} rows, got {rows_written}")
+
+        out.write(_chunk(b"IDAT", compressor.flush()))
+        out.write(_chunk(b"IEND", b""))
+
+    return output_path
@@ -1,27 +1,45 @@
 from PIL import Image
+import numpy as np
 import pillow_heif
 import os
-from rembg import remove
+from heic_decode import decode_heic
+from bbox_detect import content_bbox
+from background_removal import DEFAULT_MODEL, get_remover
+from uniform_background import remove_uniform_background
+from instrumentation import PipelineTrace
 
 # Register HEIF opener with pillow
 pillow_heif.register_heif_opener()
 
-def process_heic_photo(input_path, output_prefix="processed"):
+def process_heic_photo(input_path, output_prefix="processed", save_intermediates=False,
+                       model_name=DEFAULT_MODEL, max_size=None, inference_size=None):
     """
     Complete processing pipeline for HEIC photos:
     1. Flip horizontally to face right
     2. Remove background
-    3. Add white background
-    4. Crop excess white space
+    3. Crop to the subject and add a white background
+    
+    Stages hand images to each other in memory. Only the final image is
+    written unless save_intermediates is set. Each stage is timed and a
+    summary table is printed at the end (see instrumentation.py for the
+    JSONL report and profiling switches).
     
     Args:
         input_path (str): Path to the input HEIC image
         output_prefix (str): Prefix for output filenames
+        save_intermediates (bool): Also write the flipped, no-background and
+            white-background stages to disk
+        model_name (str): rembg model used for background removal
+        max_size (tuple): Largest (width, height) needed, e.g. for web or
+            preview output; avoids a full-resolution decode when possible
+        inference_size (int): Run background segmentation on a copy
+            downscaled to this longest side (default: full resolution)
     
     Returns:
         dict: Dictionary with paths to all generated versions
     """
     results = {}
+    trace = PipelineTrace(input_path)
     
     try:
         # Check if input file exists
@@ -33,40 +51,50 @@ def process_heic_photo(input_path, output_prefix="processed"):
         
         # Step 1: Flip the image horizontally
         print("Step 1: Flipping image horizontally...")
-        flipped_path = flip_image_horizontal(input_path, f"{output_prefix}_flipped.png")
-        if flipped_path:
-            results['flipped'] = flipped_path
-            print(f"✅ Flipped image saved: {flipped_path}")
-        else:
+        with trace.stage("decode", input_path) as stage:
+            decoded = stage.output(_open_stage_input(input_path, max_size))
+        with trace.stage("flip", decoded) as stage:
+            flipped = stage.output(flip_image_horizontal(decoded))
+        if flipped is None:
             print("❌ Failed to flip image")
             return results
+        if save_intermediates:
+            with trace.stage("save flipped", flipped) as stage:
+                results['flipped'] = stage.output(_save_stage(flipped, f"{output_prefix}_flipped.png"))
+            print(f"✅ Flipped image saved: {results['flipped']}")
+        else:
+            print("✅ Image flipped")
         
         # Step 2: Remove background
         print("\nStep 2: Removing background...")
-        no_bg_path = remove_background_ai(flipped_path, f"{output_prefix}_no_bg.png")
-        if no_bg_path:
-            results['no_background'] = no_bg_path
-            print(f"✅ Background removed: {no_bg_path}")
-        else:
+        with trace.stage("remove bg", flipped) as stage:
+            no_bg = stage.output(remove_background_ai(flipped, model_name=model_name,
+                                                      inference_size=inference_size))
+        if no_bg is None:
             print("❌ Failed to remove background")
             return results
-        
-        # Step 3: Add white background
-        print("\nStep 3: Adding white background...")
-        white_bg_path = add_white_background(no_bg_path, f"{output_prefix}_white_bg.png")
-        if white_bg_path:
-            results['white_background'] = white_bg_path
-            print(f"✅ White background added: {white_bg_path}")
+        if save_intermediates:
+            with trace.stage("save no bg", no_bg) as stage:
+                results['no_background'] = stage.output(_save_stage(no_bg, f"{output_prefix}_no_bg.png"))
+            print(f"✅ Background removed: {results['no_background']}")
         else:
-            print("❌ Failed to add white background")
-            return results
+            print("✅ Background removed")
+        
+        if save_intermediates:
+            with trace.stage("save white bg", no_bg) as stage:
+                results['white_background'] = stage.output(
+                    add_white_background(no_bg, f"{output_prefix}_white_bg.png")
+                )
+            print(f"✅ White background added: {results['white_background']}")
         
-        # Step 4: Crop excess white space
-        print("\nStep 4: Cropping excess white space...")
-        cropped_path = smart_crop_photo(white_bg_path, f"{output_prefix}_final.png")
-        if cropped_path:
-            results['final'] = cropped_path
-            print(f"✅ Final cropped image: {cropped_path}")
+        # Step 3: Crop to the subject, then flatten only what is kept
+        print("\nStep 3: Cropping to subject and adding white background...")
+        with trace.stage("crop+flatten", no_bg) as stage:
+            final = stage.output(flatten_and_crop(no_bg))
+        if final is not None:
+            with trace.stage("encode png", final) as stage:
+                results['final'] = stage.output(_save_stage(final, f"{output_prefix}_final.png"))
+            print(f"✅ Final cropped image: {results['final']}")
         else:
             print("❌ Failed to crop image")
         
@@ -77,97 +105,197 @@ def process_heic_photo(input_path, output_prefix="processed"):
     except Exception as e:
         print(f"Error in processing pipeline: {e}")
         return results
+    
+    finally:
+        if trace.stages:
+            print("\n" + trace.summary())
+            trace.write_report()
+
+def _open_stage_input(source, max_size=None):
+    """Return a PIL image for a file path, PIL image or numpy array."""
+    if isinstance(source, Image.Image):
+        return source
+    if isinstance(source, np.ndarray):
+        return Image.fromarray(source)
+    return decode_heic(source, max_size)
+
+def _save_stage(img, output_path):
+    """Save a stage result as PNG and return its path."""
+    img.save(output_path, 'PNG')
+    return output_path
+
+def _finish_stage(img, output_path):
+    """Save the stage result if an output path is given, otherwise return it."""
+    if output_path is None:
+        return img
+    return _save_stage(img, output_path)
 
-def flip_image_horizontal(input_path, output_path):
-    """Flip image horizontally."""
+def flip_image_horizontal(source, output_path=None, max_size=None):
+    """
+    Flip image horizontally.
+    
+    Args:
+        source: Input file path, PIL image or numpy array
+        output_path (str): Where to save the result; if None the flipped
+            image is returned instead of a path
+        max_size (tuple): Largest (width, height) needed when decoding a file
+    """
     try:
-        with Image.open(input_path) as img:
-            flipped_img = img.transpose(Image.FLIP_LEFT_RIGHT)
-            flipped_img.save(output_path)
-        return output_path
+        img = _open_stage_input(source, max_size)
+        flipped_img = img.transpose(Image.FLIP_LEFT_RIGHT)
+        return _finish_stage(flipped_img, output_path)
     except Exception as e:
         print(f"Error flipping image: {e}")
         return None
 
-def remove_background_ai(input_path, output_path):
-    """Remove background using AI."""
+def remove_background_ai(source, output_path=None, model_name=DEFAULT_MODEL, inference_size=None):
+    """
+    Remove background using AI.
+    
+    Photos on a plain backdrop are cut out with the border flood fill
+    instead; only the rest go through the rembg model.
+    
+    Args:
+        source: Input file path, PIL image or numpy array
+        output_path (str): Where to save the result; if None the RGBA image
+            is returned instead of a path
+        model_name (str): rembg model; its session is shared across calls
+        inference_size (int): Longest side the model runs at; the mask is
+            upsampled to full resolution with a guided filter
+    """
     try:
-        with open(input_path, 'rb') as input_file:
-            input_data = input_file.read()
-        
-        output_data = remove(input_data)
-        
-        with open(output_path, 'wb') as output_file:
-            output_file.write(output_data)
-        
-        return output_path
+        img = _open_stage_input(source)
+        result = remove_uniform_background(img)
+        if result is None:
+            result = get_remover(model_name).remove(img, inference_size)
+        return _finish_stage(result, output_path)
     except Exception as e:
         print(f"Error removing background: {e}")
         return None
 
-def add_white_background(input_path, output_path):
-    """Add white background to transparent image."""
+def add_white_background(source, output_path=None):
+    """
+    Add white background to transparent image.
+    
+    Args:
+        source: Input file path, PIL image or numpy array
+        output_path (str): Where to save the result; if None the RGB image
+            is returned instead of a path
+    """
     try:
-        img = Image.open(input_path).convert("RGBA")
+        img = _open_stage_input(source).convert("RGBA")
         white_bg = Image.new("RGBA", img.size, (255, 255, 255, 255))
         result = Image.alpha_composite(white_bg, img)
         result = result.convert("RGB")
-        result.save(output_path, "PNG")
-        return output_path
+        return _finish_stage(result, output_path)
     except Exception as e:
         print(f"Error adding white background: {e}")
         return None
 
-def smart_crop_photo(input_path, output_path, margin_percent=8):
-    """Smart crop to remove excess white space."""
+def _margin_box(bbox, size, margin_percent):
+    """Grow a (left, top, right, bottom) box by a share of its size, within the image."""
+    left, top, right, bottom = bbox
+    margin_w = int((right - left) * margin_percent / 100)
+    margin_h = int((bottom - top) * margin_percent / 100)
+    return (
+        max(0, left - margin_w),
+        max(0, top - margin_h),
+        min(size[0], right + margin_w),
+        min(size[1], bottom + margin_h),
+    )
+
+def flatten_and_crop(source, output_path=None, margin_percent=8, alpha_threshold=5):
+    """
+    Crop a cutout to its subject, then composite it onto white.
+    
+    The subject's bounding box comes straight from the alpha channel, and
+    only the cropped region is flattened.
+    
+    Args:
+        source: Input file path, PIL image or numpy array (RGBA cutout)
+        output_path (str): Where to save the result; if None the RGB image
+            is returned instead of a path
+        margin_percent (int): Percentage of content size to keep as margin
+        alpha_threshold (int): Alpha values at or below this are background;
+            the default matches what stays white (>= 250) after flattening
+    """
     try:
-        import numpy as np
+        img = _open_stage_input(source)
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
         
-        img = Image.open(input_path).convert('RGB')
-        img_array = np.array(img)
+        # Bounding box of the thresholded alpha, found by Pillow in C
+        table = [0] * (alpha_threshold + 1) + [255] * (255 - alpha_threshold)
+        bbox = img.getchannel('A').point(table).getbbox()
+        if bbox is None:
+            print("No content found for cropping")
+            return None
         
-        # Find non-white pixels
-        white_threshold = 250
-        non_white = (img_array[:, :, 0] < white_threshold) | \
-                   (img_array[:, :, 1] < white_threshold) | \
-                   (img_array[:, :, 2] < white_threshold)
+        crop_box = _margin_box(bbox, img.size, margin_percent)
+        cropped = img.crop(crop_box)
+        
+        white_bg = Image.new("RGBA", cropped.size, (255, 255, 255, 255))
+        result = Image.alpha_composite(white_bg, cropped).convert("RGB")
+        
+        print(f"Cropped from {img.width}x{img.height} to {result.width}x{result.height}")
+        
+        return _finish_stage(result, output_path)
+    except Exception as e:
+        print(f"Error cropping image: {e}")
+        return None
+
+def smart_crop_photo(source, output_path=None, margin_percent=8):
+    """
+    Smart crop to remove excess white space.
+    
+    Args:
+        source: Input file path, PIL image or numpy array
+        output_path (str): Where to save the result; if None the cropped
+            image is returned instead of a path
+        margin_percent (int): Percentage of content size to keep as margin
+    """
+    try:
+        img = _open_stage_input(source).convert('RGB')
         
-        # Find bounding box of content
-        rows = np.any(non_white, axis=1)
-        cols = np.any(non_white, axis=0)
+        # Find bounding box of non-white content, scanning in from the edges
+        white_threshold = 250
+        bbox = content_bbox(img, threshold=white_threshold)
         
-        if not np.any(rows) or not np.any(cols):
+        if bbox is None:
             print("No content found for cropping")
             return None
         
-        # Get content boundaries
-        top, bottom = np.where(rows)[0][[0, -1]]
-        left, right = np.where(cols)[0][[0, -1]]
-        
-        # Calculate margins
-        content_width = right - left
-        content_height = bottom - top
-        margin_w = int(content_width * margin_percent / 100)
-        margin_h = int(content_height * margin_percent / 100)
+        # Get content boundaries (last content row/column, inclusive)
+        left, top, right, bottom = bbox
+        right -= 1
+        bottom -= 1
         
         # Apply margins
-        crop_left = max(0, left - margin_w)
-        crop_top = max(0, top - margin_h)
-        crop_right = min(img.width, right + margin_w)
-        crop_bottom = min(img.height, bottom + margin_h)
+        crop_left, crop_top, crop_right, crop_bottom = _margin_box(
+            (left, top, right, bottom), img.size, margin_percent
+        )
         
         # Crop and save
         cropped_img = img.crop((crop_left, crop_top, crop_right, crop_bottom))
-        cropped_img.save(output_path, 'PNG')
         
         print(f"Cropped from {img.width}x{img.height} to {crop_right-crop_left}x{crop_bottom-crop_top}")
         
-        return output_path
+        return _finish_stage(cropped_img, output_path)
     except Exception as e:
         print(f"Error cropping image: {e}")
         return None
 
 if __name__ == "__main__":
+    import sys
+    
+    # Batch mode: python process_img0829.py <directory-or-glob> [output_dir]
+    if len(sys.argv) > 1:
+        from batch_process import print_batch_report, process_heic_batch
+        
+        output_dir = sys.argv[2] if len(sys.argv) > 2 else None
+        print_batch_report(process_heic_batch(sys.argv[1], output_dir))
+        sys.exit(0)
+    
     # Process IMG_0829.HEIC
     input_file = "IMG_0829.HEIC"
     
@@ -1,15 +1,20 @@
 from PIL import Image
 import numpy as np
-from rembg import remove
 import os
+from background_removal import DEFAULT_MODEL, get_remover
+from color_key import key_out_colour
+from uniform_background import dominant_border_colour, remove_uniform_background
 
-def remove_background_rembg(input_path, output_path=None):
+def remove_background_rembg(input_path, output_path=None, model_name=DEFAULT_MODEL, inference_size=None):
     """
     Remove background from an image using rembg library.
     
     Args:
         input_path (str): Path to the input image
         output_path (str): Path to save the image with transparent background
+        model_name (str): rembg model; its session is shared across calls
+        inference_size (int): Run the model on a copy downscaled to this
+            longest side and upsample the mask (default: full resolution)
     
     Returns:
         str: Path to the output image
@@ -27,17 +32,15 @@ def remove_background_rembg(input_path, output_path=None):
         print(f"Opening {input_path}...")
         
         # Read the input image
-        with open(input_path, 'rb') as input_file:
-            input_data = input_file.read()
+        img = Image.open(input_path)
         
         print("Removing background...")
-        # Remove background using rembg
-        output_data = remove(input_data)
+        # Remove background using the shared rembg session
+        result_img = get_remover(model_name).remove(img, inference_size)
         
         # Save the result
         print(f"Saving image with transparent background to {output_path}...")
-        with open(output_path, 'wb') as output_file:
-            output_file.write(output_data)
+        result_img.save(output_path, 'PNG')
         
         print(f"Successfully created image with transparent background: {output_path}")
         return output_path
@@ -47,6 +50,38 @@ def remove_background_rembg(input_path, output_path=None):
         print("Make sure you have rembg installed: pip install rembg")
         return None
 
+def remove_background_rembg_batch(input_paths, model_name=DEFAULT_MODEL):
+    """
+    Remove backgrounds from several images with one model session.
+    
+    Args:
+        input_paths (list): Paths to the input images
+        model_name (str): rembg model to load once for the whole batch
+    
+    Returns:
+        list: Output paths (None for images that failed), in input order
+    """
+    remover = get_remover(model_name)
+    results = []
+    
+    for input_path in input_paths:
+        try:
+            if not os.path.exists(input_path):
+                raise FileNotFoundError(f"Input file not found: {input_path}")
+            
+            name, ext = os.path.splitext(input_path)
+            output_path = f"{name}_no_bg.png"
+            
+            print(f"Removing background from {input_path}...")
+            remover.remove(Image.open(input_path)).save(output_path, 'PNG')
+            results.append(output_path)
+            
+        except Exception as e:
+            print(f"Error processing {input_path}: {e}")
+            results.append(None)
+    
+    return results
+
 def remove_background_manual(input_path, output_path=None):
     """
     Remove background manually using color-based segmentation (fallback method).
@@ -80,21 +115,12 @@ def remove_background_manual(input_path, output_path=None):
         
         # Create a mask for the background (this is a simple approach)
         # We'll assume the background is relatively uniform
-        # Sample the corners to get background color
-        h, w = data.shape[:2]
-        corner_samples = [
-            data[0, 0], data[0, w-1], data[h-1, 0], data[h-1, w-1]
-        ]
-        
-        # Use the most common corner color as background
-        bg_color = corner_samples[0][:3]  # RGB only
+        # Use the most common colour along the image border as background
+        bg_color = dominant_border_colour(data)
         
-        # Create mask based on color similarity
+        # Set pixels similar to the background color to transparent
         tolerance = 30  # Adjust this value as needed
-        mask = np.sqrt(np.sum((data[:, :, :3] - bg_color) ** 2, axis=2)) < tolerance
-        
-        # Set background pixels to transparent
-        data[mask] = [0, 0, 0, 0]  # Transparent
+        key_out_colour(data, bg_color, tolerance, [0, 0, 0, 0])
         
         # Create new image
         result_img = Image.fromarray(data, 'RGBA')
@@ -110,16 +136,55 @@ def remove_background_manual(input_path, output_path=None):
         print(f"Error processing image: {e}")
         return None
 
+def remove_background_auto(input_path, output_path=None, model_name=DEFAULT_MODEL, inference_size=None):
+    """
+    Remove the background, using rembg only when the backdrop is not plain.
+    
+    The image border is classified first; uniform backdrops are removed with
+    a border-connected flood fill at colour-key speed, everything else goes
+    through the rembg model.
+    
+    Args:
+        input_path (str): Path to the input image
+        output_path (str): Path to save the image with transparent background
+        model_name (str): rembg model for non-uniform backgrounds
+        inference_size (int): Longest side rembg runs at (default: full resolution)
+    
+    Returns:
+        str: Path to the output image
+    """
+    try:
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+        
+        result = remove_uniform_background(Image.open(input_path))
+        
+        if result is None:
+            print("Using rembg...")
+            return remove_background_rembg(input_path, output_path, model_name, inference_size)
+        
+        if output_path is None:
+            name, ext = os.path.splitext(input_path)
+            output_path = f"{name}_no_bg.png"
+        
+        result.save(output_path, 'PNG')
+        print(f"Successfully created image with transparent background: {output_path}")
+        return output_path
+        
+    except Exception as e:
+        print(f"Error processing image: {e}")
+        return None
+
 if __name__ == "__main__":
     # Remove background from the flipped image
     input_file = "IMG_9089_flipped.png"
     
-    # Try rembg first (AI-based background removal)
-    print("Attempting AI-based background removal...")
-    result = remove_background_rembg(input_file)
+    # Plain backdrops take the fast path, others use rembg (AI-based removal)
+    print("Attempting background removal...")
+    result = remove_background_auto(input_file)
     
     if not result:
-        print("\nAI method failed, trying manual method...")
+        print("\nAutomatic method failed, trying manual method...")
         result = remove_background_manual(input_file)
     
     if result:
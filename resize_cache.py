@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of resized tiles with a mip pyramid per source
+Tiles are keyed by the source file's content hash, the size it was opened at,
+the target size and everything that shapes the resize (filter, gaps, Pillow
+version). Each source also keeps box-filtered half-size levels, so a new
+target height is resampled from the nearest larger level instead of the
+original. JPEG levels start from a DCT-scaled draft decode, which is part of
+their key.
+"""
+
+from PIL import Image
+import os
+
+from disk_cache import DiskCache, content_key, file_digest
+
+DEFAULT_CACHE_DIR = os.environ.get("RESIZE_CACHE", os.path.join(".cache", "resized"))
+# 0 disables the cache
+DEFAULT_MAX_BYTES = int(os.environ.get("RESIZE_CACHE_MB", "512")) * 1024 * 1024
+
+# Bump when the way tiles or levels are produced changes, so old entries miss
+CACHE_VERSION = 2
+
+# Stop halving once a level would be shorter than this
+MIP_MIN_HEIGHT = 64
+
+# Start from a level at least this many times the target so the final
+# LANCZOS pass still has detail to work with (as image_resize.DRAFT_GAP)
+MIP_GAP = 2.0
+
+# Modes that survive a PNG round trip and box reduction unchanged
+CACHEABLE_MODES = ("L", "LA", "RGB", "RGBA")
+
+def mip_level_for(source_size, size, max_level=None):
+    """
+    Deepest pyramid level still at least MIP_GAP times the target.
+
+    Level n is the source halved n times (rounding up, as Image.reduce and
+    the JPEG draft decode do).
+
+    Args:
+        source_size (tuple): (width, height) of the source
+        size (tuple): (width, height) to produce
+        max_level (int): Stop at this level at the deepest
+
+    Returns:
+        tuple: (level, (width, height) of that level); level 0 is the source
+    """
+    level, level_size = 0, tuple(source_size)
+    while level != max_level:
+        next_size = ((level_size[0] + 1) // 2, (level_size[1] + 1) // 2)
+        if (next_size[0] < size[0] * MIP_GAP or next_size[1] < size[1] * MIP_GAP
+                or next_size[1] < MIP_MIN_HEIGHT):
+            return level, level_size
+        level, level_size = level + 1, next_size
+    return level, level_size
+
+def draft_level(source_size, level_size):
+    """
+    Pyramid level a JPEG draft decode towards level_size actually lands on.
+
+    libjpeg scales by 1/2, 1/4 or 1/8, picking the largest that keeps the
+    image at least level_size; level n is then the 1/2**n decode.
+
+    Args:
+        source_size (tuple): (width, height) of the source
+        level_size (tuple): (width, height) asked of the decoder
+
+    Returns:
+        int: The level the decode produces (0 when it is not reduced)
+    """
+    scale = min(source_size[0] // level_size[0], source_size[1] // level_size[1])
+    for level, factor in ((3, 8), (2, 4), (1, 2)):
+        if scale >= factor:
+            return level
+    return 0
+
+def _can_draft(img):
+    """True for a JPEG that has not been decoded yet, so draft() still applies."""
+    return img.format == "JPEG" and len(img.tile) == 1
+
+class ResizeCache:
+    """
+    On-disk store of resized tiles and mip levels with LRU eviction.
+
+    Args:
+        directory (str): Cache directory (default: $RESIZE_CACHE or .cache/resized)
+        max_bytes (int): Size cap (default: $RESIZE_CACHE_MB megabytes, 512)
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.store = DiskCache(directory, max_bytes, suffix=".png")
+
+    def tile_key(self, source_hash, mode, source_size, size, method, drafted, params):
+        """
+        Return the cache key for a source resized to size.
+
+        source_size is the size the source was opened at, so a reduced
+        decode of a file (a thumbnail) never shares entries with the full image.
+
+        Args:
+            method (str): "exact" or "mip"
+            drafted (bool): Whether the source could still be draft-decoded
+            params (tuple): Values that identify the resize (filter, gaps)
+        """
+        return content_key(
+            f"v{CACHE_VERSION}", Image.__version__, source_hash, mode,
+            f"{source_size[0]}x{source_size[1]}", f"{size[0]}x{size[1]}", method,
+            f"draft={drafted}", f"mip_gap={MIP_GAP}", f"mip_min={MIP_MIN_HEIGHT}",
+            *(str(param) for param in params),
+        )
+
+    def level_key(self, source_hash, mode, source_size, level, origin):
+        """
+        Return the cache key for one mip level of a source opened at source_size.
+
+        origin is the level the chain was decoded at: 0 for a full decode,
+        n for a JPEG draft at 1/2**n that the box reductions continued from.
+        """
+        _, level_size = mip_level_for(source_size, (0, 0), max_level=level)
+        return content_key(
+            f"v{CACHE_VERSION}", Image.__version__, source_hash, mode,
+            f"{source_size[0]}x{source_size[1]}", f"mip{level}",
+            f"{level_size[0]}x{level_size[1]}", f"from{origin}", "box",
+        )
+
+    def load(self, key):
+        """
+        Load a cached image.
+
+        Returns:
+            PIL.Image: The image, or None on a miss
+        """
+        path = self.store.get(key)
+        if path is None:
+            return None
+        try:
+            with Image.open(path) as img:
+                img.load()
+                return img.copy()
+        except (OSError, ValueError):
+            # Corrupt (or just evicted by another worker): treat as a miss
+            self.store.discard(key)
+            return None
+
+    def save(self, key, img):
+        """Store an image under a key."""
+        self.store.put(key, lambda path: img.save(path, "PNG", compress_level=1))
+
+    def mip_level(self, img, source_hash, size):
+        """
+        The nearest pyramid level at least as large as size, building the
+        pyramid from img on the first request.
+
+        A JPEG not yet loaded is decoded at the DCT scale of the wanted level
+        (as image_resize does). Every level records the decode it descends
+        from, and only levels whose own draft would land on that decode are
+        stored, so a key always holds the same pixels whatever the request
+        order.
+
+        Args:
+            img (PIL.Image): Opened source image
+            source_hash (str): Content hash of the source file
+            size (tuple): (width, height) that will be produced from the level
+
+        Returns:
+            PIL.Image: The level, or None when img itself should be resized
+        """
+        source_size, mode = img.size, img.mode
+        level, level_size = mip_level_for(source_size, size)
+        if level == 0:
+            return None
+
+        deepest, _ = mip_level_for(source_size, (0, 0))
+        sizes = [mip_level_for(source_size, (0, 0), max_level=index)[1]
+                 for index in range(deepest + 1)]
+        drafting = _can_draft(img)
+
+        def origin(index):
+            return draft_level(source_size, sizes[index]) if drafting else 0
+
+        start = origin(level)
+        cached = self.load(self.level_key(source_hash, mode, source_size, level, start))
+        if cached is not None:
+            return cached
+
+        if drafting:
+            # The draft scale is 1/2**n, so the decode is itself level n
+            img.draft(mode, level_size)
+            if img.size != sizes[start]:
+                return None
+
+        # Build the levels from the decode down to MIP_MIN_HEIGHT in one pass,
+        # stopping past the wanted level once no more share this decode
+        current, wanted = img, None
+        for index in range(start, deepest + 1):
+            if index > level and origin(index) != start:
+                break
+            if index > start:
+                current = current.reduce(2)
+            if index > 0 and origin(index) == start:
+                self.save(self.level_key(source_hash, mode, source_size, index, start), current)
+            if index == level:
+                wanted = current
+        return wanted
+
+    def resize(self, img, size, resize, params, exact=False):
+        """
+        Resize an opened image file, from the cache when possible.
+
+        Args:
+            img (PIL.Image): Opened source image with a filename
+            size (tuple): (width, height) to produce
+            resize (callable): resize(source, size) used on a miss
+            params (tuple): Values that identify what resize does (filter,
+                gaps); part of the tile key
+            exact (bool): Resample from the full-resolution source, not a mip level
+
+        Returns:
+            PIL.Image: The resized image
+        """
+        source_hash = file_digest(img.filename)
+        key = self.tile_key(source_hash, img.mode, img.size, size, "exact" if exact else "mip",
+                            _can_draft(img), params)
+        tile = self.load(key)
+        if tile is None:
+            level = None if exact else self.mip_level(img, source_hash, size)
+            tile = resize(level if level is not None else img, size)
+            self.save(key, tile)
+        return tile
+
+# Shared cache used by image_resize; set by configure_resize_cache()
+_default_cache = None
+_configured = False
+
+def configure_resize_cache(directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Choose where the shared resize cache lives for this process.
+
+    Callers that know their cache location (the build graph, the benchmark
+    workers) pass it here instead of through the environment; otherwise the
+    first resize uses $RESIZE_CACHE and $RESIZE_CACHE_MB.
+
+    Args:
+        directory (str): Cache directory
+        max_bytes (int): Size cap; 0 disables the cache
+
+    Returns:
+        ResizeCache: The shared cache, or None when disabled
+    """
+    global _default_cache, _configured
+    _configured = True
+    if max_bytes <= 0:
+        _default_cache = None
+        return None
+
+    directory = os.path.abspath(directory)
+    store = _default_cache.store if _default_cache is not None else None
+    if store is None or (store.directory, store.max_bytes) != (directory, max_bytes):
+        _default_cache = ResizeCache(directory, max_bytes)
+    return _default_cache
+
+def default_resize_cache():
+    """
+    The shared on-disk resize cache.
+
+    Returns:
+        ResizeCache: The cache, or None when it is disabled
+    """
+    if not _configured:
+        configure_resize_cache()
+    return _default_cache
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Fast path for portraits shot on plain backdrops
+Classifies the background from a histogram of the image border and, when it
+is uniform, removes it with a vectorized border-connected flood fill
+"""
+
+from PIL import Image
+import numpy as np
+
+from color_key import colour_distance_mask
+
+# Border pixels must be within this distance of the dominant colour...
+UNIFORM_TOLERANCE = 30
+# ...and make up at least this share of the border for a uniform verdict
+UNIFORM_FRACTION = 0.9
+
+def sample_border(data, thickness=4):
+    """
+    Collect the RGB pixels of an image's outer frame.
+
+    Args:
+        data (np.ndarray): uint8 image array (H, W, 3 or 4)
+        thickness (int): Frame thickness in pixels
+
+    Returns:
+        np.ndarray: (N, 3) uint8 border pixels
+    """
+    height, width = data.shape[:2]
+    t = max(1, min(thickness, height // 2, width // 2))
+    rgb = data[:, :, :3]
+    return np.concatenate([
+        rgb[:t].reshape(-1, 3),
+        rgb[height - t:].reshape(-1, 3),
+        rgb[t:height - t, :t].reshape(-1, 3),
+        rgb[t:height - t, width - t:].reshape(-1, 3),
+    ])
+
+def dominant_border_colour(data, thickness=4):
+    """
+    Find the most common background colour along the image border.
+
+    Border pixels are binned at 5 bits per channel; the colour returned is
+    the median of the pixels in the fullest bin.
+
+    Args:
+        data (np.ndarray): uint8 image array (H, W, 3 or 4)
+        thickness (int): Frame thickness in pixels
+
+    Returns:
+        np.ndarray: RGB colour (uint8)
+    """
+    border = sample_border(data, thickness)
+    quantized = (border >> 3).astype(np.int32)
+    bins = (quantized[:, 0] << 10) | (quantized[:, 1] << 5) | quantized[:, 2]
+    dominant = np.bincount(bins, minlength=1 << 15).argmax()
+    return np.median(border[bins == dominant], axis=0).astype(np.uint8)
+
+def classify_border(data, tolerance=UNIFORM_TOLERANCE, min_fraction=UNIFORM_FRACTION, thickness=4):
+    """
+    Decide whether an image has a uniform background.
+
+    Args:
+        data (np.ndarray): uint8 image array (H, W, 3 or 4)
+        tolerance (float): Colour distance counted as "the same" backdrop
+        min_fraction (float): Share of border pixels that must match
+        thickness (int): Frame thickness in pixels
+
+    Returns:
+        tuple: (is_uniform, background colour, matching fraction)
+    """
+    border = sample_border(data, thickness)
+    colour = dominant_border_colour(data, thickness)
+    matches = colour_distance_mask(border[np.newaxis], colour, tolerance)
+    fraction = float(matches.mean())
+    return fraction >= min_fraction, colour, fraction
+
+def _run_ids(mask):
+    """Label horizontal runs of True in each row; 0 marks False pixels."""
+    height, width = mask.shape
+    flat = mask.ravel()
+    starts = flat.copy()
+    starts[1:] &= ~flat[:-1]
+    starts[::width] = flat[::width]
+    ids = np.cumsum(starts, dtype=np.int32)
+    ids[~flat] = 0
+    return ids.reshape(height, width), int(ids.max())
+
+def _spread(ids, run_count, reached):
+    """Mark every run that contains at least one reached pixel."""
+    hit = np.zeros(run_count + 1, dtype=bool)
+    hit[ids[reached]] = True
+    hit[0] = False
+    return hit[ids]
+
+def border_connected(candidate):
+    """
+    Flood fill a mask from the image border, fully vectorized.
+
+    Each sweep spreads along whole horizontal runs, then whole vertical runs,
+    so the number of sweeps depends on how often the background path turns,
+    not on the image size. Sweeps repeat until one reaches no new pixels.
+
+    Args:
+        candidate (np.ndarray): bool (H, W) mask of pixels that may be filled
+
+    Returns:
+        np.ndarray: bool mask of candidate pixels connected to the border
+    """
+    row_ids, row_runs = _run_ids(candidate)
+    col_ids, col_runs = _run_ids(np.ascontiguousarray(candidate.T))
+
+    reached = np.zeros_like(candidate)
+    reached[0] = candidate[0]
+    reached[-1] = candidate[-1]
+    reached[:, 0] = candidate[:, 0]
+    reached[:, -1] = candidate[:, -1]
+
+    count = int(np.count_nonzero(reached))
+    while True:
+        reached = _spread(row_ids, row_runs, reached)
+        reached = _spread(col_ids, col_runs, np.ascontiguousarray(reached.T)).T
+        new_count = int(np.count_nonzero(reached))
+        if new_count == count:
+            break
+        count = new_count
+
+    return np.ascontiguousarray(reached)
+
+def uniform_background_mask(data, colour=None, tolerance=UNIFORM_TOLERANCE):
+    """
+    Mask the backdrop of an image with a uniform background.
+
+    Args:
+        data (np.ndarray): uint8 image array (H, W, 3 or 4)
+        colour (sequence): Backdrop colour (default: dominant border colour)
+        tolerance (float): Colour distance treated as backdrop
+
+    Returns:
+        np.ndarray: bool mask, True for background pixels
+    """
+    if colour is None:
+        colour = dominant_border_colour(data)
+    candidate = colour_distance_mask(data, colour, tolerance)
+    return border_connected(candidate)
+
+def remove_uniform_background(img, tolerance=UNIFORM_TOLERANCE, min_fraction=UNIFORM_FRACTION):
+    """
+    Cut out an image shot on a plain backdrop without running a model.
+
+    Args:
+        img (PIL.Image): Image to cut out
+        tolerance (float): Colour distance treated as backdrop
+        min_fraction (float): Share of border pixels that must match the backdrop
+
+    Returns:
+        PIL.Image: RGBA image with a transparent background, or None when the
+            border is not uniform and a segmentation model is needed
+    """
+    data = np.array(img.convert("RGBA"))
+    uniform, colour, fraction = classify_border(data, tolerance, min_fraction)
+    if not uniform:
+        print(f"Background is not uniform ({fraction:.0%} of border matches)")
+        return None
+
+    print(f"Uniform background {tuple(int(c) for c in colour)} "
+          f"({fraction:.0%} of border), using fast path...")
+    data[uniform_background_mask(data, colour, tolerance)] = 0
+    return Image.fromarray(data, "RGBA")
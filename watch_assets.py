@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Watch the source images and rebuild the derived assets that use them
+Runs the build graph in this process so decoded sources, resized tiles and
+file hashes stay in memory between rebuilds; a change to one photo only
+re-renders the targets downstream of it. Uses inotify when the optional
+inotify_simple package is installed and polls file stats otherwise.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from build_graph import ROOT, build, default_targets
+from image_resize import enable_memory_cache
+
+# Quiet period after an event before rebuilding, so editors that write a
+# file in several steps trigger one rebuild
+SETTLE_SECONDS = 0.2
+
+def source_files(targets):
+    """
+    Inputs that no target produces, i.e. the files a person edits.
+
+    Args:
+        targets (list): Build graph targets
+
+    Returns:
+        set: Source paths relative to the repo root
+    """
+    produced = {path for target in targets for path in target.outputs}
+    return {path for target in targets for path in target.inputs if path not in produced}
+
+def affected_targets(targets, changed):
+    """
+    Targets that read a changed file, directly or through another target.
+
+    Args:
+        targets (list): Build graph targets
+        changed (set): Changed paths relative to the repo root
+
+    Returns:
+        list: Names of the targets to rebuild
+    """
+    dirty = set(changed)
+    affected = []
+    grew = True
+    while grew:
+        grew = False
+        for target in targets:
+            if target.name not in affected and dirty.intersection(target.inputs):
+                affected.append(target.name)
+                dirty.update(target.outputs)
+                grew = True
+    return affected
+
+def _stat(path):
+    try:
+        stat = os.stat(os.path.join(ROOT, path))
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class PollingWatcher:
+    """
+    Detects changes by comparing file stats every interval.
+
+    Args:
+        paths (set): Files to watch, relative to the repo root
+        interval (float): Seconds between scans
+    """
+
+    def __init__(self, paths, interval=0.5):
+        self.interval = interval
+        self.watch(paths)
+
+    def watch(self, paths):
+        """Replace the set of watched files, keeping the last seen stats of known ones."""
+        self.paths = set(paths)
+        previous = getattr(self, "stats", {})
+        self.stats = {path: previous[path] if path in previous else _stat(path) for path in self.paths}
+
+    def scan(self):
+        """Return the watched files whose stats changed since the last scan."""
+        changed = set()
+        for path, previous in self.stats.items():
+            current = _stat(path)
+            if current != previous:
+                self.stats[path] = current
+                changed.add(path)
+        return changed
+
+    def changes(self):
+        """Block until at least one watched file changes; return the changed paths."""
+        while True:
+            time.sleep(self.interval)
+            changed = self.scan()
+            if not changed:
+                continue
+            # Collect the rest of a burst of writes
+            while True:
+                time.sleep(SETTLE_SECONDS)
+                more = self.scan()
+                if not more:
+                    return changed
+                changed.update(more)
+
+class InotifyWatcher:
+    """
+    Detects changes with inotify on the repo directory.
+
+    Args:
+        paths (set): Files to watch, relative to the repo root
+    """
+
+    def __init__(self, paths):
+        from inotify_simple import INotify, flags
+
+        self.inotify = INotify()
+        self.inotify.add_watch(
+            ROOT, flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.DELETE | flags.MOVED_FROM
+        )
+        self.watch(paths)
+
+    def watch(self, paths):
+        """Replace the set of watched files."""
+        self.paths = set(paths)
+
+    def changes(self):
+        """Block until at least one watched file changes; return the changed paths."""
+        while True:
+            changed = {event.name for event in self.inotify.read() if event.name in self.paths}
+            if not changed:
+                continue
+            # Collect the rest of a burst of writes
+            while True:
+                events = self.inotify.read(timeout=int(SETTLE_SECONDS * 1000))
+                if not events:
+                    return changed
+                changed.update(event.name for event in events if event.name in self.paths)
+
+def make_watcher(paths, poll_interval=0.5, force_polling=False):
+    """
+    inotify watcher when available, polling watcher otherwise.
+
+    Args:
+        paths (set): Files to watch, relative to the repo root
+        poll_interval (float): Seconds between scans when polling
+        force_polling (bool): Skip inotify even when it is installed
+
+    Returns:
+        PollingWatcher or InotifyWatcher
+    """
+    if not force_polling:
+        try:
+            return InotifyWatcher(paths)
+        except ImportError:
+            print("Warning: inotify_simple not installed, polling for changes")
+        except OSError as e:
+            print(f"Warning: inotify unavailable ({e}), polling for changes")
+    return PollingWatcher(paths, poll_interval)
+
+def watch(poll_interval=0.5, force_polling=False, cache_mb=1024):
+    """
+    Build everything once, then rebuild affected targets on every change.
+
+    Args:
+        poll_interval (float): Seconds between scans when polling
+        force_polling (bool): Poll even if inotify is available
+        cache_mb (int): Memory budget for decoded sources and resized tiles
+    """
+    cache = enable_memory_cache(cache_mb * 1024 * 1024)
+
+    print("🔨 Initial build...")
+    build(in_process=True)
+
+    targets = default_targets()
+    watcher = make_watcher(source_files(targets), poll_interval, force_polling)
+    print(f"\n👀 Watching {len(watcher.paths)} source files (Ctrl+C to stop)")
+
+    while True:
+        changed = watcher.changes()
+        started = time.perf_counter()
+        print(f"\n✏️  Changed: {', '.join(sorted(changed))}")
+
+        # Re-read the graph: added or removed sources change the glob-based targets
+        targets = default_targets()
+        watcher.watch(source_files(targets))
+
+        names = affected_targets(targets, changed)
+        if not names:
+            print("Nothing depends on these files")
+            continue
+
+        try:
+            status = build(targets, only=names, in_process=True)
+        except Exception as e:
+            print(f"❌ Rebuild failed: {e}")
+            status = {}
+        rebuilt = [name for name, value in status.items() if value == "built"]
+        print(f"⏱️  Rebuilt {len(rebuilt)} target(s) in {time.perf_counter() - started:.2f}s "
+              f"(memory cache: {cache.hits} hits, {cache.misses} misses, "
+              f"{cache.total_bytes / (1024 * 1024):.0f} MB)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--poll", action="store_true", help="Poll file stats instead of using inotify")
+    parser.add_argument("--interval", type=float, default=0.5, help="Polling interval in seconds")
+    parser.add_argument("--cache-mb", type=int, default=1024, help="In-memory image cache budget")
+    args = parser.parse_args()
+
+    try:
+        watch(args.interval, args.poll, args.cache_mb)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
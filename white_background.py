@@ -1,6 +1,7 @@
 from PIL import Image
 import numpy as np
 import os
+from color_key import key_out_colour
 
 def make_background_white(input_path, output_path=None):
     """
@@ -92,12 +93,9 @@ def make_background_white_simple(input_path, output_path=None):
         # Use the most common corner color as background
         bg_color = corner_samples[0]  # Start with first corner
         
-        # Create mask for background pixels
+        # Replace pixels similar to the background color with white
         tolerance = 40  # Adjust this value as needed
-        mask = np.sqrt(np.sum((data - bg_color) ** 2, axis=2)) < tolerance
-        
-        # Replace background pixels with white
-        data[mask] = [255, 255, 255]  # White
+        key_out_colour(data, bg_color, tolerance, [255, 255, 255])
         
         # Create new image
         result_img = Image.fromarray(data, 'RGB')